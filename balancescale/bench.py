@@ -0,0 +1,92 @@
+# Benchmarks, headless under the SDL dummy driver:
+#   python balancescale/bench.py physics [--out FILE] [--samples N] [--iterations N]
+#   python balancescale/bench.py render [--out FILE] [--samples N]
+#   python balancescale/bench.py startup [--out FILE] [--samples N]
+#   python balancescale/bench.py compare [--suites ...] [--update]
+import argparse
+import importlib
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+from benchmarks.common import print_table, write_report
+
+SUITES = ("physics", "render", "startup")
+
+def run_suite(name, samples=None, **options):
+    suite = importlib.import_module(f"benchmarks.{name}")
+    if samples is not None:
+        options["samples"] = samples
+    return suite, suite.run(**options)
+
+def compare_command(args):
+    from benchmarks import regress
+    reports = {name: run_suite(name, args.samples)[1] for name in args.suites}
+    if args.update:
+        regress.save_baseline(reports, args.baseline)
+        regress.append_history(reports, path=args.history)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update on the reference machine")
+        return 2
+
+    rows = regress.compare(regress.load_baseline(args.baseline), reports, args.min_effect)
+    regress.print_comparison(rows)
+    regress.append_history(reports, rows, args.history)
+    slower = [row[0] for row in rows if row[-1] == "slower"]
+    if slower:
+        print(f"Significant slowdown in {len(slower)} metric(s): {', '.join(slower)}")
+        return 1
+    return 0
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="bench.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    physics = commands.add_parser("physics", help="space.step, weight distribution, create/kill, scale contacts")
+    physics.add_argument("--out", help="write the JSON report here")
+    physics.add_argument("--samples", type=int, default=100)
+    physics.add_argument("--counts", type=int, nargs="+")
+    physics.add_argument("--iterations", type=int, help="override space.iterations")
+
+    render = commands.add_parser("render", help="per-component draw times and frame budgets")
+    render.add_argument("--out", help="write the JSON report here")
+    render.add_argument("--samples", type=int, default=200)
+
+    startup = commands.add_parser("startup", help="cold import and setup time")
+    startup.add_argument("--out", help="write the JSON report here")
+    startup.add_argument("--samples", type=int, default=10)
+
+    from benchmarks import regress
+    compare = commands.add_parser("compare", help="check for slowdowns against the baseline")
+    compare.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    compare.add_argument("--samples", type=int, help="samples per metric (suite default if unset)")
+    compare.add_argument("--baseline", default=regress.BASELINE_FILE)
+    compare.add_argument("--history", default=regress.HISTORY_FILE)
+    compare.add_argument("--min-effect", type=float, default=regress.MIN_EFFECT,
+                         help="smallest slowdown that counts, as a fraction")
+    compare.add_argument("--update", action="store_true", help="write a new baseline instead")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare_command(args)
+
+    options = {}
+    if args.command == "physics":
+        options = {"iterations": args.iterations}
+        if args.counts:
+            options["counts"] = args.counts
+    suite, report = run_suite(args.command, args.samples, **options)
+
+    print_table(report["results"])
+    if "budget" in report:
+        suite.print_budget(report["budget"])
+    if "contacts" in report:
+        suite.print_contacts(report["contacts"])
+    if args.out:
+        write_report(report, args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
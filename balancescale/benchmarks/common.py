@@ -0,0 +1,69 @@
+import json
+import platform
+import subprocess
+import time
+import numpy as np
+import pygame
+import pymunk
+from constants import *
+
+def measure(fn, samples, warmup=3, per_call=1):
+    """Call fn warmup + samples times; return milliseconds per operation.
+
+    per_call is how many operations one call of fn performs.
+    """
+    for _ in range(warmup):
+        fn()
+    times = np.empty(samples)
+    for i in range(samples):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    return times * 1000 / per_call
+
+def summarize(ms):
+    ms = np.asarray(ms)
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        "ops_per_sec": float(1000 / ms.mean()),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "min_ms": float(ms.min()),
+        "max_ms": float(ms.max()),
+        "samples_ms": np.round(ms, 5).tolist(),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except OSError:
+        return None
+
+def metadata(**extra):
+    meta = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "pygame": pygame.version.ver,
+        "pymunk": pymunk.version,
+    }
+    meta.update(extra)
+    return meta
+
+def write_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+
+def print_table(results, columns=("ops_per_sec", "p50_ms", "p90_ms", "p99_ms")):
+    width = max(len(name) for name in results)
+    print(" " * width + "".join(f"{column:>14}" for column in columns))
+    for name, result in results.items():
+        if "skipped" in result:
+            print(f"{name:<{width}}  skipped: {result['skipped']}")
+            continue
+        print(f"{name:<{width}}" + "".join(f"{result[column]:>14.4f}" for column in columns))
@@ -0,0 +1,135 @@
+import numpy as np
+from constants import *
+from benchmarks.common import measure, metadata, summarize
+from engine.core import Engine
+from engine.geometry import contact_report
+from engine.history import pack_particles, unpack_particles
+from engine.particle import Particle
+from engine.timeline import KEYFRAME_DTYPE
+
+COUNTS = (10, 100, 1000, 10000)
+CONTACT_COUNT = 1000  # Particles in the scene the scale geometry pass is checked on
+BURST = 20  # Steps timed from the same starting scene before it is restored
+
+def layout(rng, count):
+    """Mixed sizes packed in rows from just above the scale upwards."""
+    sizes = rng.integers(0, len(RADII), count)
+    positions = []
+    x, y = PAD[0], SCALE_POS[1] - 200
+    row = 0
+    for n in sizes:
+        radius = RADII[n]
+        if x + 2 * radius > WIDTH - PAD[0]:
+            x, y = PAD[0], y - row - 1
+            row = 0
+        positions.append((x + radius, y - radius))
+        x += 2 * radius + 1
+        row = max(row, 2 * radius)
+    return positions, sizes.tolist()
+
+def build_engine(count, seed=0, iterations=None, optimize_geometry=OPTIMIZE_SCALE_GEOMETRY):
+    engine = Engine(seed=seed, optimize_geometry=optimize_geometry)
+    if iterations is not None:
+        engine.space.iterations = iterations
+    engine.spawn_many(*layout(engine.rng, count))
+    return engine
+
+class Scene:
+    """Restores an engine to the same state, so every burst does the same work."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.particles = pack_particles(engine.particles, KEYFRAME_DTYPE)
+        self.scale = (engine.scale_body.angle, engine.scale_body.angular_velocity)
+
+    def restore(self):
+        self.engine.clear()
+        unpack_particles(self.engine, self.particles)
+        self.engine.reset_scale(*self.scale)
+
+def bench_stepping(count, samples, iterations=None):
+    engine = build_engine(count, iterations=iterations)
+    dt = 1 / PHYSICS_HZ
+    engine.run(5, dt)  # Let contacts form
+    scene = Scene(engine)
+    space_step, weights, engine_step = [], [], []
+    for _ in range(max(1, samples // BURST)):
+        scene.restore()
+        space_step += measure(lambda: engine.space.step(dt), BURST, warmup=0).tolist()
+        weights += measure(lambda: engine.scale.calculate_weight_distribution(engine.particles),
+                           BURST, warmup=0).tolist()
+        scene.restore()
+        engine_step += measure(lambda: engine.step(dt), BURST, warmup=0).tolist()
+    return {
+        f"space_step/{count}": summarize(space_step),
+        f"weight_distribution/{count}": summarize(weights),
+        f"engine_step/{count}": summarize(engine_step),
+    }
+
+def bench_lifecycle(samples, batch=100):
+    # Creation with fresh pymunk objects, the pooled spawn, and kill + reap
+    engine = Engine(seed=0)
+    positions, sizes = layout(engine.rng, batch)
+    made = []
+
+    def create():
+        made.extend(Particle(pos, n, engine.space, engine.shape_to_particle)
+                    for pos, n in zip(positions, sizes))
+
+    def discard():
+        for particle in made:
+            engine.space.remove(particle.body, particle.shape)
+            engine.shape_to_particle.pop(particle.shape)
+        made.clear()
+
+    create_ms = []
+    for _ in range(samples):
+        create_ms += measure(create, 1, warmup=0, per_call=batch).tolist()
+        discard()
+
+    spawn_ms, kill_ms = [], []
+    for _ in range(samples):
+        spawn_ms += measure(lambda: engine.spawn_many(positions, sizes), 1, warmup=0,
+                            per_call=batch).tolist()
+        live = [p for p in engine.particles if p.alive]
+
+        def kill():
+            for particle in live:
+                engine.kill(particle)
+            engine.reap()
+        kill_ms += measure(kill, 1, warmup=0, per_call=batch).tolist()
+    return {
+        "create": summarize(create_ms),
+        "spawn_pooled": summarize(spawn_ms),
+        "kill": summarize(kill_ms),
+    }
+
+def bench_contacts(count, iterations=None):
+    # Broadphase pairs and arbiters on the scale body, with and without the
+    # geometry pass, over the same settling scene
+    report = contact_report(lambda optimize: build_engine(count, iterations=iterations,
+                                                          optimize_geometry=optimize))
+    return {label: {"pairs": pairs, "arbiters": arbiters}
+            for label, (pairs, arbiters) in report.items()}
+
+def print_contacts(contacts):
+    for label, entry in contacts.items():
+        print(f"scale contacts {label:<6}: {entry['pairs']:.1f} broadphase pairs, "
+              f"{entry['arbiters']:.1f} arbiters per step")
+
+def run(counts=COUNTS, samples=100, iterations=None, contact_count=CONTACT_COUNT):
+    """Run the physics suite; returns a report dict ready for JSON."""
+    results = {}
+    for count in counts:
+        # Big scenes are slow per step, so take fewer samples of them
+        results.update(bench_stepping(count, samples if count < 10000 else max(BURST, samples // 5),
+                                      iterations))
+    results.update(bench_lifecycle(samples))
+    space = Engine().space
+    return {
+        "suite": "physics",
+        "meta": metadata(density=DENSITY, bias=BIAS, gravity=GRAVITY, physics_hz=PHYSICS_HZ,
+                         iterations=iterations or space.iterations),
+        "results": results,
+        "contacts": bench_contacts(contact_count, iterations),
+    }
@@ -0,0 +1,79 @@
+import json
+import os
+import numpy as np
+from benchmarks.common import git_commit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+HISTORY_FILE = os.path.join(BENCH_DIR, "history.jsonl")  # Per machine, so not committed
+BOOTSTRAP_ROUNDS = 2000
+CONFIDENCE = 0.95
+MIN_EFFECT = 0.05  # Ignore changes smaller than 5% even when they are significant
+
+def bootstrap_ratio(base, current, rng, rounds=BOOTSTRAP_ROUNDS, confidence=CONFIDENCE):
+    """Ratio of medians (current / base) with a bootstrap confidence interval."""
+    base = np.asarray(base)
+    current = np.asarray(current)
+    base_medians = np.median(rng.choice(base, (rounds, len(base))), axis=1)
+    current_medians = np.median(rng.choice(current, (rounds, len(current))), axis=1)
+    ratios = current_medians / base_medians
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(ratios, [tail, 100 - tail])
+    return float(np.median(current) / np.median(base)), float(low), float(high)
+
+def compare(baseline, current, min_effect=MIN_EFFECT, seed=0):
+    """Compare every metric both reports share.
+
+    Returns rows of (suite/metric, base ms, current ms, ratio, low, high,
+    verdict). A metric is "slower" only when the whole confidence interval
+    is above 1 + min_effect, and "faster" when it is below 1 - min_effect.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for suite, report in current.items():
+        if suite not in baseline:
+            continue
+        base_results = baseline[suite]["results"]
+        for name, result in report["results"].items():
+            base = base_results.get(name)
+            if base is None or "samples_ms" not in base or "samples_ms" not in result:
+                continue
+            ratio, low, high = bootstrap_ratio(base["samples_ms"], result["samples_ms"], rng)
+            if low > 1 + min_effect:
+                verdict = "slower"
+            elif high < 1 - min_effect:
+                verdict = "faster"
+            else:
+                verdict = "same"
+            rows.append((f"{suite}/{name}", base["p50_ms"], result["p50_ms"], ratio, low, high, verdict))
+    return rows
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(reports, path=BASELINE_FILE):
+    with open(path, "w") as f:
+        json.dump(reports, f, indent=1)
+
+def append_history(reports, rows=(), path=HISTORY_FILE):
+    # One line per run: medians of every metric, for plotting trends
+    entry = {
+        "time": next(iter(reports.values()))["meta"]["time"],
+        "commit": git_commit(),
+        "p50_ms": {f"{suite}/{name}": result["p50_ms"]
+                   for suite, report in reports.items()
+                   for name, result in report["results"].items() if "p50_ms" in result},
+        "slower": [row[0] for row in rows if row[-1] == "slower"],
+    }
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+def print_comparison(rows):
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'metric':<{width}}  {'base ms':>10}  {'now ms':>10}  {'ratio':>6}  {'95% CI':>15}")
+    for name, base, now, ratio, low, high, verdict in rows:
+        flag = "" if verdict == "same" else f"  {verdict.upper()}"
+        print(f"{name:<{width}}  {base:>10.4f}  {now:>10.4f}  {ratio:>6.3f}  "
+              f"[{low:>5.3f}, {high:>5.3f}]{flag}")
@@ -0,0 +1,129 @@
+import math
+import pygame
+from constants import *
+from benchmarks.common import measure, metadata, summarize
+from benchmarks.physics import build_engine
+from engine.controls import button_rects
+
+FPS_BUDGETS = (60, 144, 240)
+PARTICLE_COUNTS = (100, 1000)
+# What a busy game frame draws: the components summed for the budget report
+GAME_FRAME = ("scale_draw", "particles_batch/100", "buttons_hover_toggle", "hud_changing")
+
+def bench_game(surface, samples):
+    import simulation
+    results = {}
+
+    engine = build_engine(0)
+    scale = simulation.Scale(engine.scale_body, prewarm=True)
+    frame = [0]
+
+    def draw_scale():
+        # Sweep the whole tilt range; the prewarmed cache holds every angle
+        # in it, so this times the layout and blits, not rotations
+        frame[0] += 1
+        angle = math.radians(MAX_ANGLE) * math.sin(frame[0] * 0.05)
+        scale.body.angle = scale.prev_angle = angle
+        scale.draw(surface)
+    results["scale_draw"] = summarize(measure(draw_scale, samples))
+
+    sprites = simulation.get_particle_sprites()
+    for count in PARTICLE_COUNTS:
+        particles = build_engine(count).particles
+
+        def draw_batch():
+            sprites.prepare(particles)
+            sprites.draw_batch(surface)
+        results[f"particles_batch/{count}"] = summarize(measure(draw_batch, samples))
+
+        def draw_each():
+            for particle in particles:
+                particle.draw(surface)
+        results[f"particle_draw/{count}"] = summarize(measure(draw_each, samples))
+
+    buttons = [simulation.ImageButton(label, rect.topleft, rect.size)
+               for label, rect in zip("ABCD", button_rects().values())]
+    outside = (WIDTH // 2, HEIGHT // 2)
+
+    def toggle_buttons():
+        # Every frame the pointer moves onto or off the buttons
+        frame[0] += 1
+        for button in buttons:
+            button.draw(surface, button.rect.center if frame[0] % 2 else outside)
+    results["buttons_hover_toggle"] = summarize(measure(toggle_buttons, samples))
+    results["buttons_steady"] = summarize(measure(
+        lambda: [button.draw(surface, outside) for button in buttons], samples))
+
+    hud = simulation.WeightDisplay()
+
+    def draw_hud(change):
+        frame[0] += 1
+        hud.update(frame[0] * 0.5 if change else 1, 2, frame[0] % 10 if change else 0)
+        hud.draw(surface)
+    results["hud_changing"] = summarize(measure(lambda: draw_hud(True), samples))
+    results["hud_steady"] = summarize(measure(lambda: draw_hud(False), samples))
+
+    overlay = simulation.PauseOverlay()
+    results["pause_overlay"] = summarize(measure(lambda: overlay.draw(surface), samples))
+    return results
+
+def bench_screens(surface, samples):
+    results = {}
+    import loading
+    char_surfaces, char_strokes = loading.make_loading_text()
+    frame = [0]
+
+    def loading_frame():
+        frame[0] += 1
+        loading.draw_loading(surface, frame[0] / 60, char_surfaces, char_strokes)
+    results["loading_frame"] = summarize(measure(loading_frame, samples))
+
+    import start
+    try:
+        welcome = start.WelcomeScene().warm()
+    except (FileNotFoundError, pygame.error) as e:
+        results["welcome_frame"] = {"skipped": str(e)}
+        return results
+    welcome.text_index = len(start.full_text)
+
+    def welcome_frame(hovered):
+        frame[0] += 1
+        welcome.draw(surface, frame[0] * 16, hovered)
+    results["welcome_frame"] = summarize(measure(lambda: welcome_frame(False), samples))
+    results["welcome_frame_hover"] = summarize(measure(lambda: welcome_frame(True), samples))
+    return results
+
+def frame_budget(results, budgets=FPS_BUDGETS, frame=GAME_FRAME):
+    """Share of each frame budget every component takes, by median."""
+    report = {}
+    total = sum(results[name]["p50_ms"] for name in frame if name in results)
+    for fps in budgets:
+        budget = 1000 / fps
+        report[str(fps)] = {
+            "budget_ms": budget,
+            "game_frame_ms": total,
+            "fits": total <= budget,
+            "share": {name: result["p50_ms"] / budget
+                      for name, result in results.items() if "p50_ms" in result},
+        }
+    return report
+
+def run(samples=200):
+    """Run the render suite against an offscreen surface; returns a report dict."""
+    from initialize import display
+    screen = display.init_display()
+    surface = pygame.Surface(screen.get_size()).convert()
+    results = bench_game(surface, samples)
+    results.update(bench_screens(surface, samples))
+    return {
+        "suite": "render",
+        "meta": metadata(size=list(surface.get_size()), driver=pygame.display.get_driver()),
+        "results": results,
+        "budget": frame_budget(results),
+    }
+
+def print_budget(budget):
+    for fps, entry in budget.items():
+        verdict = "fits" if entry["fits"] else "over"
+        print(f"{fps:>4} FPS: {entry['budget_ms']:.2f} ms budget, game frame "
+              f"{entry['game_frame_ms']:.2f} ms ({verdict})")
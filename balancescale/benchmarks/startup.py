@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+from benchmarks.common import metadata, summarize
+
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.dirname(GAME_DIR)  # Asset paths are relative to the repo root
+
+# Run in a fresh interpreter each time, so imports and asset loads are cold
+PROBE = """
+import json, time
+start = time.perf_counter()
+import simulation
+imported = time.perf_counter()
+simulation.SimulationScene().warm()  # Window, engine, sprites and layers
+ready = time.perf_counter()
+print(json.dumps({"import_simulation": imported - start, "game_setup": ready - start}))
+"""
+
+def probe():
+    env = dict(os.environ, PYTHONPATH=GAME_DIR, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run(samples=10):
+    """Time cold starts of the game in subprocesses; returns a report dict."""
+    times = {}
+    for _ in range(samples):
+        for name, seconds in probe().items():
+            times.setdefault(name, []).append(seconds * 1000)
+    return {
+        "suite": "startup",
+        "meta": metadata(),
+        "results": {name: summarize(ms) for name, ms in times.items()},
+    }
@@ -8,3 +8,119 @@ YELLOW = (255, 255, 0)
 RED = (255, 0, 0)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
+
+
+# Window size (shared by initialize/display.py and the headless engine)
+WIDTH, HEIGHT = 1920, 1080
+
+# Play area
+PAD = (24, 160)
+A = (PAD[0], PAD[1])
+B = (PAD[0], HEIGHT - PAD[0])
+C = (WIDTH - PAD[0], HEIGHT - PAD[0])
+D = (WIDTH - PAD[0], PAD[1])
+BG_COLOR = (255, 240, 148)
+W_COLOR = (255, 190, 58)
+COLORS = [
+    (245, 0, 0),
+    (250, 100, 100),
+    (150, 20, 250),
+    (250, 210, 10),
+    (250, 150, 0),
+    (245, 0, 0),
+    (250, 250, 100),
+    (255, 180, 180),
+    (255, 255, 0),
+    (100, 235, 10),
+]
+
+# Physics
+FPS = 240
+PHYSICS_HZ = 240          # Fixed physics steps per second
+PHYSICS_SUBSTEPS = 1      # space.step calls per physics step
+MAX_CATCH_UP_STEPS = 8    # Physics steps allowed per rendered frame
+RENDER_FPS = FPS          # Frame rate cap for drawing
+RADII = [17, 25, 32, 38, 45, 55, 64, 75, 87, 100]  # Particle sizes
+THICKNESS = 15     # Wall thickness
+DENSITY = 0.01    # Particle density
+ELASTICITY = 0.2   # Bounce factor
+IMPULSE = 10000    # Force applied
+GRAVITY = 10000     # Gravity strength
+DAMPING = 1      # Energy loss factor
+NEXT_DELAY = FPS
+NEXT_STEPS = 30
+BIAS = 0.00001
+POINTS = [1, 3, 6, 10, 15, 21, 28, 36, 45, 55]
+WEIGHT_MULTIPLIER = 0.1  # Conversion factor for KG
+
+# Define the specific size values
+SIZE_VALUES = [0.5, 1, 1.5, 2, 2.5, 3, 5, 7, 11, 16]
+
+# Idle detection
+SETTLE_ANGULAR_VELOCITY = 0.01  # Scale counts as still below this (rad/s)
+SETTLE_SPEED = 400.0            # Particles count as still below this (px/s)
+SETTLE_DRIFT = 3.0              # Max distance a particle may creep while settling (px)
+SETTLE_STEPS = PHYSICS_HZ // 2  # Steps everything must stay still to settle
+IDLE_WAIT_MS = 500              # Longest blocking wait for input while idle
+
+# Scale bar
+SCALE_WIDTH = 900  # New width of the scale bar (700 + 40)
+SCALE_HEIGHT = 300 # Height of the scale bar remains the same
+SCALE_POS = (WIDTH // 2, HEIGHT // 2 + 50)  # Adjusted center position of the scale
+SCALE_LEFT = SCALE_POS[0] - SCALE_WIDTH // 2
+SCALE_RIGHT = SCALE_POS[0] + SCALE_WIDTH // 2
+MAX_ANGLE = 10  # Maximum tilt angle in degrees
+
+# How the scale is held: "controller" runs the Python torque controller every
+# step, "constraints" leaves the tilt limit and damping to Chipmunk joints
+SCALE_MODE = "controller"
+SCALE_SPRING_STIFFNESS = 1e9  # Centering torque per radian (constraints mode)
+SCALE_SPRING_DAMPING = 5e8    # About critical for the beam's moment of inertia
+OPTIMIZE_SCALE_GEOMETRY = True  # Drop scale shapes that others fully cover
+# Weigh each side from contact impulses instead of particle positions, in
+# either scale mode. Off by default: the impulses are summed by a Python
+# callback for every particle touching the scale, which makes a step about
+# 4x slower. Without it the display weighs everything on each side of the
+# pivot, including particles still in the air or leaning on the walls
+CONTACT_LOADS = False
+CONTACT_LOAD_SMOOTHING = 0.25  # Seconds; contact loads are low-pass filtered over about this long
+
+# Bulk spawning
+BULK_COUNT = 100  # Particles dropped by one bulk drop
+POUR_RATE = 30    # Particles per second while pouring
+POUR_WIDTH = 120  # Width of the stream under the cursor
+DROP_REGION = (SCALE_LEFT, -2 * HEIGHT, SCALE_RIGHT, PAD[1])  # left, top, right, bottom; tall so a batch rains in
+
+# Undo history
+HISTORY_MAX_ENTRIES = 256         # Oldest commands are evicted past this
+HISTORY_MAX_BYTES = 4 * 1024 * 1024  # ...or once their snapshots take this much
+
+# Buttons, in a row along the bottom left: start, undo, stop, reset
+BUTTON_SIZE = (180, 160)
+BUTTON_SPACING = 20
+BUTTON_Y = HEIGHT - 180
+BUTTON_NAMES = ("start", "undo", "stop", "reset")
+
+# Input recording
+INPUT_LOG = None            # Path to record the session's input to, or None
+REPLAY_HASH_EVERY = 240     # Steps between state hashes in the log
+
+# Timeline keyframes
+TIMELINE_EVERY = PHYSICS_HZ          # Steps between keyframes
+TIMELINE_KEYFRAMES = 3600            # Keyframes kept (an hour at one per second)...
+TIMELINE_MAX_BYTES = 64 * 1024 * 1024  # ...or fewer once they take this much
+
+# Scene files
+SCENE_FILE = "scene.dge"  # F5 saves the scene here, F9 loads it
+
+# Frame profiler (F3 shows the overlay, F4 writes the buffer to CSV)
+PROFILE_FRAMES = 600       # Frames kept in the ring buffer
+PROFILE_REFRESH = 15       # Frames between overlay text updates
+PROFILE_CSV = "profile-%Y%m%d-%H%M%S.csv"  # strftime pattern for exports
+
+# Span tracing (utils/trace.py); the DGE_TRACE environment variable overrides TRACE_FILE
+TRACE_FILE = None            # Path for a Chrome trace of the run, or None
+TRACE_MAX_EVENTS = 1000000   # Recording stops after this many spans
+
+# Loading screen
+PRELOAD_WORKERS = 4  # Threads decoding assets and importing modules behind the loading screen
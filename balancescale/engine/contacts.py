@@ -0,0 +1,59 @@
+import numpy as np
+from constants import *
+
+LEFT, RIGHT = 0, 1
+
+def on_collision(space, type_a, type_b, post_solve):
+    # pymunk 7 replaced add_collision_handler with on_collision
+    if hasattr(space, "on_collision"):
+        space.on_collision(type_a, type_b, post_solve=post_solve)
+    else:
+        handler = space.add_collision_handler(type_a, type_b)
+        handler.post_solve = post_solve
+
+class PlateLoadSensor:
+    """Measures the load on each side of the scale from contact impulses.
+
+    A post-solve handler between particles (collision type 1) and the scale
+    (collision type 2) adds the vertical part of each arbiter's impulse to the
+    left or right slot, depending on which side of the pivot the contact is.
+    Only particles actually touching the scale are visited.
+
+    Loads are in SIZE_VALUES units, like the weights on the display: each
+    contact's impulse is scaled by its particle's SIZE_VALUES weight over its
+    pymunk mass. That is exact while masses are proportional to SIZE_VALUES;
+    otherwise a particle resting on a different size is weighed at the ratio
+    of the one under it.
+
+    Impulses jitter from step to step, so ``load`` follows the measurement
+    through a low-pass filter with time constant ``smoothing`` seconds.
+    """
+
+    def __init__(self, space, scale_body, mapper, smoothing=CONTACT_LOAD_SMOOTHING):
+        self.scale_body = scale_body
+        self.smoothing = smoothing
+        self.mapper = mapper  # shape -> particle
+        self.impulse = np.zeros(2)   # Accumulated over the current step
+        self.measured = np.zeros(2)  # Last step's load
+        self.load = np.zeros(2)      # Filtered
+        on_collision(space, 1, 2, self.post_solve)
+
+    def post_solve(self, arbiter, space, data):
+        points = arbiter.contact_point_set.points
+        if not points:
+            return
+        local = self.scale_body.world_to_local(points[0].point_b)
+        shape = arbiter.shapes[0]
+        weight = SIZE_VALUES[self.mapper[shape].n] / shape.mass
+        # total_impulse acts on the particle, so the scale feels the opposite;
+        # only the vertical part is weight (wall pushes cancel out)
+        self.impulse[LEFT if local.x < 0 else RIGHT] -= arbiter.total_impulse.y * weight
+
+    def begin_step(self):
+        self.impulse[:] = 0
+
+    def end_step(self, dt):
+        # Impulse over the step / dt is force; / gravity is supported weight
+        np.multiply(self.impulse, 1 / (dt * GRAVITY), out=self.measured)
+        self.load += (self.measured - self.load) * min(1.0, dt / self.smoothing)
+        return self.load
@@ -0,0 +1,177 @@
+import numpy as np
+import pygame
+from constants import *
+from engine.history import History
+from engine.particle import PreParticle
+from engine.scene_io import load_scene, read_scene
+from engine.spawner import drop, Hopper
+from engine.timeline import Timeline
+
+def button_rects():
+    width, height = BUTTON_SIZE
+    return {name: pygame.Rect(50 + (width + BUTTON_SPACING) * i, BUTTON_Y, width, height)
+            for i, name in enumerate(BUTTON_NAMES)}
+
+def hover_rect(rect):
+    # ImageButton grows by 10% around its center while hovered
+    grown = pygame.Rect(0, 0, int(rect.width * 1.1), int(rect.height * 1.1))
+    grown.center = rect.center
+    return grown
+
+class Controls:
+    """Applies input events to the engine: the game's rules without the display.
+
+    The main loop feeds it pygame events and calls ``step`` for every physics
+    step. A replay does the same from a recorded log, headless. If a
+    ``recorder`` is set, every event it handles is written to it.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.history = History()
+        self.hopper = Hopper(engine)  # P toggles pouring, B drops a batch
+        self.paused = False
+        self.dragging = False
+        self.selected_size = 0
+        self.mouse = (WIDTH // 2, 0)  # Last pointer position seen
+        self.current_particle = PreParticle(WIDTH // 2, 0)
+        self.rects = button_rects()
+        self.hovered = dict.fromkeys(self.rects, False)
+        self.left_weight = 0
+        self.right_weight = 0
+        self.dt = 1 / PHYSICS_HZ  # Step size of the last step(), for re-simulating
+        self.substeps = PHYSICS_SUBSTEPS
+        self.recorder = None
+        self.timeline = Timeline(self)
+
+    def preview(self, n):
+        particle = PreParticle(self.mouse[0], n)
+        particle.set_x(self.mouse[0])
+        return particle
+
+    def button_at(self, pos):
+        for name, rect in self.rects.items():
+            if (hover_rect(rect) if self.hovered[name] else rect).collidepoint(pos):
+                return name
+        return None
+
+    def track_hover(self, pos):
+        # Same rule as ImageButton.update, so clicks near an edge hit the same button
+        for name, rect in self.rects.items():
+            self.hovered[name] = (hover_rect(rect) if self.hovered[name] else rect).collidepoint(pos)
+
+    def scrubbing(self, event):
+        # While paused, the left/right keys move through the timeline; Undo
+        # always undoes
+        if not self.paused or self.timeline.seeking:
+            return False
+        return event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFT, pygame.K_RIGHT)
+
+    def handle(self, event):
+        seeking = self.timeline.seeking
+        if self.recorder is not None and not seeking:
+            self.recorder.event(self.engine.steps, event)
+        if self.scrubbing(event):
+            if event.key == pygame.K_RIGHT:
+                self.timeline.next()
+            else:
+                self.timeline.previous()
+            return
+        self.timeline.event(self.engine.steps, event)
+
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left click
+                button = self.button_at(event.pos)
+                if button is not None:
+                    self.press(button)
+                # Only create particle if not clicking buttons
+                elif not self.dragging:
+                    new_particle = self.current_particle.release(self.engine)
+                    self.current_particle = self.preview(self.selected_size)
+                    self.history.record_add([new_particle])
+            elif event.button == 3:  # Right click
+                self.dragging = True
+
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if event.button == 3:
+                self.dragging = False
+
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse = event.pos
+            self.track_hover(event.pos)
+            self.current_particle.set_x(event.pos[0])
+            self.hopper.region = self.current_particle.pour_region()
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.select((self.selected_size + 1) % len(SIZE_VALUES))
+            elif event.key == pygame.K_DOWN:
+                self.select((self.selected_size - 1) % len(SIZE_VALUES))
+            elif event.key == pygame.K_b:
+                # Drop a batch of random sizes across the scale
+                self.history.record_add(drop(self.engine, BULK_COUNT))
+            elif event.key == pygame.K_p:
+                if self.hopper.running:
+                    # The whole pour undoes as one action
+                    self.history.record_add(self.hopper.stop())
+                else:
+                    self.hopper.weights = np.eye(len(SIZE_VALUES))[self.selected_size]
+                    self.hopper.region = self.current_particle.pour_region()
+                    self.hopper.start()
+
+    def load(self, path, scene=None):
+        # Read first: a file that can't be loaded leaves everything as it was
+        if scene is None:
+            scene = read_scene(path)
+        self.hopper.stop()
+        count = load_scene(self.engine, scene)
+        # Old commands and keyframes belong to the scene that was replaced
+        self.history.clear()
+        self.timeline = Timeline(self)
+        print(f"Loaded {count} particles from {path}")
+        return count
+
+    def select(self, n):
+        self.selected_size = n
+        self.current_particle = self.preview(n)
+
+    def press(self, button):
+        engine = self.engine
+        if not self.timeline.seeking:
+            print(f"{button.capitalize()} button clicked")
+        if button == "start":
+            # Simply ensure the simulation is running (not paused)
+            self.paused = False
+
+        elif button == "reset":
+            # Save current state before resetting
+            self.history.record_reset(engine, size=self.selected_size)
+            engine.clear()
+            engine.reset_scale()
+            self.selected_size = 0
+            self.current_particle = PreParticle(WIDTH // 2, 0)
+
+        elif button == "undo":
+            # Adds remove their particles; resets bring back the particles
+            # and the scale with the motion they had
+            command = self.history.undo(engine)
+            if command is not None and command.kind == "reset":
+                self.select(command.extra["size"])
+
+        elif button == "stop":
+            # Always pause the simulation when stop is clicked
+            self.paused = True
+
+    @property
+    def busy(self):
+        # Something will happen without input, so the loop must not idle
+        return not self.paused and (self.hopper.running or not self.engine.settled)
+
+    def step(self, dt, substeps=1):
+        self.dt = dt
+        self.substeps = substeps
+        self.hopper.update(dt)
+        self.left_weight, self.right_weight = self.engine.step(dt, substeps)
+        self.timeline.stepped(self.engine)
+        if self.recorder is not None and not self.timeline.seeking:
+            self.recorder.stepped(self.engine)
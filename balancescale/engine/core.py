@@ -0,0 +1,173 @@
+import time
+import numpy as np
+import pymunk
+from constants import *
+from engine.contacts import PlateLoadSensor
+from engine.geometry import optimize_scale_geometry
+from engine.idle import SettleDetector
+from engine.pool import ParticlePool
+from engine.scale import create_scale, PLATE_ANCHORS, ScalePhysics
+from engine.store import ParticleStore
+from utils import trace
+
+def create_space():
+    space = pymunk.Space()
+    space.gravity = (0, GRAVITY)
+    space.damping = DAMPING
+    space.collision_bias = BIAS
+    return space
+
+class Engine:
+    """Headless balance scale simulation.
+
+    Owns the pymunk space, the scale and the particles. Nothing here touches
+    the display, so it can be stepped as fast as the CPU allows.
+    """
+
+    def __init__(self, seed=None, scale_cls=ScalePhysics, scale_mode=SCALE_MODE,
+                 optimize_geometry=OPTIMIZE_SCALE_GEOMETRY, contact_loads=CONTACT_LOADS):
+        self.rng = np.random.default_rng(seed)
+        with trace.span("create_space", "setup"):
+            self.space = create_space()
+            self.shape_to_particle = dict()
+            self.particles = ParticleStore(space=self.space)
+            self.pool = ParticlePool(self.space, self.shape_to_particle)
+            self.scale_body, self.scale_shape, self.plates = create_scale(self.space, scale_mode)
+        if optimize_geometry:
+            with trace.span("optimize_scale_geometry", "setup"):
+                optimize_scale_geometry(self.space, self.scale_body)
+        with trace.span(scale_cls.__name__, "setup"):
+            self.scale = scale_cls(self.scale_body, mode=scale_mode)
+        self.plate_sensor = PlateLoadSensor(self.space, self.scale_body, self.shape_to_particle) if contact_loads else None
+        self.left_weight = 0
+        self.right_weight = 0
+        self.steps = 0
+        self.reclaimed = 0
+        self.settle = SettleDetector()
+        self.profiler = None  # FrameProfiler to time space.step and the weights into
+
+    @property
+    def settled(self):
+        return self.settle.settled
+
+    def add(self, particle):
+        self.particles.append(particle)
+        self.settle.wake()
+        return particle
+
+    def spawn(self, pos, n):
+        return self.add(self.pool.acquire(pos, n))
+
+    def spawn_many(self, positions, sizes):
+        # One space.add for the whole batch instead of one per particle
+        batch = [self.pool.acquire(pos, n, add=False) for pos, n in zip(positions, sizes)]
+        objects = []
+        for particle in batch:
+            objects += [particle.body, particle.shape]
+        if objects:
+            self.space.add(*objects)
+        for particle in batch:
+            self.particles.append(particle)
+        self.settle.wake()
+        return batch
+
+    def kill(self, particle):
+        if particle.alive:
+            particle.kill(self.space)
+            self.settle.wake()
+
+    def cull_off_screen(self):
+        # Particles that fell below the screen, by their refreshed positions
+        particles = self.particles
+        live = np.flatnonzero(particles.alive[:len(particles)])
+        off_screen = live[particles.pos[live, 1] > HEIGHT]
+        if off_screen.size:
+            particles.cull(off_screen)
+
+    def reap(self):
+        # Reclaim dead particles: bodies culled off screen are still in the
+        # space, killed ones are still in the mapper and the store
+        dead = self.particles.compact()
+        for particle in dead:
+            if particle.body.space is not None:
+                self.space.remove(particle.body, particle.shape)
+            self.shape_to_particle.pop(particle.shape, None)
+            self.pool.release(particle)
+        if dead:
+            self.settle.wake()  # Slots moved, so the settle window restarts
+        self.reclaimed += len(dead)
+        return len(dead)
+
+    def clear(self):
+        for particle in self.particles:
+            if particle.alive:
+                particle.kill(self.space)
+            elif particle.body.space is not None:
+                self.space.remove(particle.body, particle.shape)  # Culled, not yet reaped
+            self.shape_to_particle.pop(particle.shape, None)
+            self.pool.release(particle)
+        self.reclaimed += len(self.particles)
+        self.particles.clear()
+        self.settle.wake()
+
+    def reset_scale(self, angle=0, angular_velocity=0):
+        self.scale_body.angle = angle
+        self.scale_body.angular_velocity = angular_velocity
+        self.scale_body.torque = 0
+        # The plates hang level from the beam's ends and swing with it
+        for plate, anchor in zip(self.plates, PLATE_ANCHORS):
+            plate.position = self.scale_body.local_to_world(anchor)
+            plate.velocity = self.scale_body.velocity_at_local_point(anchor)
+            plate.angle = 0
+            plate.angular_velocity = 0
+        self.settle.wake()
+
+    def step(self, dt=1 / FPS, substeps=1):
+        # Remember where things were, for interpolated drawing
+        self.particles.save_previous()
+        self.scale.prev_angle = self.scale_body.angle
+
+        sub_dt = dt / substeps
+        profiler = self.profiler
+        sensor = self.plate_sensor
+        load = None
+        for _ in range(substeps):
+            if profiler is not None:
+                start = time.perf_counter()
+            if sensor is not None:
+                sensor.begin_step()
+            self.space.step(sub_dt)
+            if sensor is not None:
+                load = sensor.end_step(sub_dt)
+            if profiler is not None:
+                stepped = time.perf_counter()
+                profiler.add("space_step", stepped - start)
+            # Chipmunk clears the torque after each step, so re-apply it
+            self.left_weight, self.right_weight = self.scale.calculate_weight_distribution(self.particles, load)
+            if profiler is not None:
+                profiler.add("weights", time.perf_counter() - stepped)
+        if sensor is not None:
+            self.particles.refresh()  # Weighing by contacts didn't read positions
+        self.cull_off_screen()
+        self.reap()
+        self.settle.update(self, dt)
+        self.steps += 1
+        return self.left_weight, self.right_weight
+
+    def run(self, steps, dt=1 / FPS, substeps=1):
+        # No clock here: run the steps back to back
+        for _ in range(steps):
+            self.step(dt, substeps)
+        return self.left_weight, self.right_weight
+
+    @property
+    def plate_load(self):
+        # (left, right) weight actually resting on each side, from contacts
+        if self.plate_sensor is None:
+            return None
+        return tuple(self.plate_sensor.load.tolist())
+
+    def interpolate(self, alpha):
+        # How far between the last two steps to draw (0 = previous, 1 = current)
+        self.particles.alpha = alpha
+        self.scale.alpha = alpha
@@ -0,0 +1,74 @@
+import pymunk
+from constants import *
+
+def point_segment_distance(p, a, b):
+    ab = b - a
+    length_sq = ab.dot(ab)
+    if length_sq == 0:
+        return (p - a).length
+    t = min(max((p - a).dot(ab) / length_sq, 0), 1)
+    return (p - (a + ab * t)).length
+
+def covered_by(shape, segment):
+    # True if every point of shape lies inside the (rounded) segment
+    if shape is segment or not isinstance(segment, pymunk.Segment):
+        return False
+    if isinstance(shape, pymunk.Poly):
+        points, radius = shape.get_vertices(), shape.radius
+    elif isinstance(shape, pymunk.Segment):
+        points, radius = [shape.a, shape.b], shape.radius
+    else:
+        return False
+    return all(point_segment_distance(p, segment.a, segment.b) + radius <= segment.radius
+               for p in points)
+
+def attached_shapes(body):
+    # body.shapes still lists shapes that were removed from the space
+    return [shape for shape in body.shapes if shape.space is not None]
+
+def optimize_scale_geometry(space, body):
+    """Remove scale shapes that another shape fully covers.
+
+    Returns the removed shapes. The plates hang on bodies of their own, so
+    only the beam's shapes are compared.
+    """
+    shapes = attached_shapes(body)
+    removed = []
+    for shape in shapes:
+        if any(covered_by(shape, other) for other in shapes if other not in removed):
+            removed.append(shape)
+    if removed:
+        space.remove(*removed)
+    return removed
+
+def contact_counts(space, body):
+    """Broadphase pairs and arbiters involving body's shapes right now."""
+    pairs = 0
+    for shape in attached_shapes(body):
+        for other in space.bb_query(shape.bb, shape.filter):
+            if other.body is not body:
+                pairs += 1
+
+    arbiters = []
+    body.each_arbiter(arbiters.append)
+    return pairs, len(arbiters)
+
+def contact_report(make_engine, steps=240, warmup=480):
+    """Average per-step (pairs, arbiters) on the beam and plates for one scene.
+
+    make_engine(optimize) must build the same scene with or without the
+    geometry pass. Returns {"before": (pairs, arbiters), "after": (...)}.
+    """
+    report = {}
+    for label, optimize in (("before", False), ("after", True)):
+        engine = make_engine(optimize)
+        engine.run(warmup)
+        pairs = arbiters = 0
+        for _ in range(steps):
+            engine.step()
+            for body in (engine.scale_body, *engine.plates):
+                p, a = contact_counts(engine.space, body)
+                pairs += p
+                arbiters += a
+        report[label] = (pairs / steps, arbiters / steps)
+    return report
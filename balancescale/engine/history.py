@@ -0,0 +1,123 @@
+from collections import deque
+import numpy as np
+from constants import *
+
+# One removed particle, packed: size index, position, velocity, angle, spin
+PARTICLE_DTYPE = np.dtype([
+    ("n", np.uint8),
+    ("pos", np.float32, 2),
+    ("vel", np.float32, 2),
+    ("angle", np.float32),
+    ("spin", np.float32),
+])
+
+def pack_particles(particles, dtype=PARTICLE_DTYPE):
+    # Live particles of a ParticleStore, in slot order
+    live = np.flatnonzero(particles.alive[:len(particles)])
+    packed = np.empty(live.size, dtype)
+    packed["n"] = particles.n[live]
+    packed["pos"] = particles.pos[live]
+    packed["vel"], packed["angle"], packed["spin"] = particles.motion(live)
+    return packed
+
+def unpack_particles(engine, packed):
+    batch = engine.spawn_many(packed["pos"].tolist(), packed["n"].tolist())
+    for particle, vel, angle, spin in zip(batch, packed["vel"].tolist(),
+                                          packed["angle"].tolist(), packed["spin"].tolist()):
+        particle.body.velocity = vel
+        particle.body.angle = angle
+        particle.body.angular_velocity = spin
+    return batch
+
+class Command:
+    """One undoable change: particles it added and a snapshot of what it removed."""
+
+    def __init__(self, kind, added=(), removed=None, scale=None, **extra):
+        self.kind = kind
+        # (particle, generation): the pool may hand the object out again later
+        self.added = [(particle, particle.generation) for particle in added]
+        self.removed = removed  # PARTICLE_DTYPE array or None
+        self.scale = scale      # (angle, angular velocity) before the change
+        self.extra = extra
+
+    @property
+    def nbytes(self):
+        size = 64 + 16 * len(self.added)
+        if self.removed is not None:
+            size += self.removed.nbytes
+        return size
+
+class History:
+    """Bounded undo stack of commands.
+
+    Adds only remember the particles they made, so undoing them is a kill per
+    particle. Resets snapshot the particles they remove into a packed array,
+    with velocities and the scale's motion, and undo respawns them in one
+    batch. The oldest commands are evicted once either limit is passed.
+    """
+
+    def __init__(self, max_entries=HISTORY_MAX_ENTRIES, max_bytes=HISTORY_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.commands = deque()
+        self.nbytes = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.commands)
+
+    def push(self, command):
+        self.commands.append(command)
+        self.nbytes += command.nbytes
+        while self.commands and (len(self.commands) > self.max_entries or self.nbytes > self.max_bytes):
+            self.nbytes -= self.commands.popleft().nbytes
+            self.evicted += 1
+        return command
+
+    def record_add(self, particles, **extra):
+        return self.push(Command("add", added=particles, **extra))
+
+    def record_reset(self, engine, **extra):
+        # Call before clearing, while the particles are still there
+        body = engine.scale_body
+        return self.push(Command("reset", removed=pack_particles(engine.particles),
+                                 scale=(body.angle, body.angular_velocity), **extra))
+
+    def undo(self, engine):
+        if not self.commands:
+            return None
+        command = self.commands.pop()
+        self.nbytes -= command.nbytes
+        for particle, generation in command.added:
+            if particle.generation == generation:
+                engine.kill(particle)
+        if command.removed is not None:
+            unpack_particles(engine, command.removed)
+        if command.scale is not None:
+            engine.reset_scale(*command.scale)
+        return command
+
+    def clear(self):
+        self.commands.clear()
+        self.nbytes = 0
+
+    def snapshot(self, slots):
+        """The commands, with their particles as indices instead of objects.
+
+        ``slots`` maps each live particle to its row in the packed scene.
+        Restoring a scene respawns every particle under a new generation, so
+        ``restore`` points the commands at the particles unpacked from it.
+        """
+        commands = [(command, [slots[particle] for particle, generation in command.added
+                               if particle.generation == generation and particle in slots])
+                    for command in self.commands]
+        return commands, self.evicted
+
+    def restore(self, snapshot, particles):
+        commands, self.evicted = snapshot
+        self.clear()
+        for command, added in commands:
+            copy = Command(command.kind, [particles[i] for i in added], command.removed,
+                           command.scale, **command.extra)
+            self.commands.append(copy)
+            self.nbytes += copy.nbytes
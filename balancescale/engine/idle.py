@@ -0,0 +1,56 @@
+from constants import *
+
+class SettleDetector:
+    """Decides when the scene has come to rest.
+
+    The scale must hold still (angular velocity and angle change) and every
+    particle must stay under ``speed`` for ``steps`` consecutive physics
+    steps. Piles jitter by a pixel or so each step under the strong gravity,
+    so at the end of that window each particle must also be within ``drift``
+    pixels of where it started it. Speeds come from the store's current and
+    previous positions, so no extra pass over the bodies is needed.
+    """
+
+    def __init__(self, angular_velocity=SETTLE_ANGULAR_VELOCITY, speed=SETTLE_SPEED,
+                 drift=SETTLE_DRIFT, steps=SETTLE_STEPS):
+        self.angular_velocity = angular_velocity
+        self.speed = speed
+        self.drift = drift
+        self.steps = steps
+        self.calm_steps = 0
+        self.anchor = None  # Particle positions at the start of the calm window
+        self.settled = False
+
+    def update(self, engine, dt):
+        body = engine.scale_body
+        calm = (abs(body.angular_velocity) < self.angular_velocity
+                and abs(body.angle - engine.scale.prev_angle) < self.angular_velocity * dt)
+
+        particles = engine.particles
+        count = len(particles)
+        pos = particles.pos[:count]
+        if calm and count:
+            moved = pos - particles.prev_pos[:count]
+            limit = self.speed * dt
+            calm = (moved * moved).sum(axis=1).max() < limit * limit
+
+        if not calm:
+            self.wake()
+            return False
+
+        if self.calm_steps == 0:
+            self.anchor = pos.copy()
+        self.calm_steps += 1
+        if self.calm_steps >= self.steps and not self.settled:
+            drift = pos - self.anchor
+            if drift.size and (drift * drift).sum(axis=1).max() > self.drift * self.drift:
+                # Still creeping: start a new window from here
+                self.calm_steps = 0
+                return False
+            self.settled = True
+        return self.settled
+
+    def wake(self):
+        self.calm_steps = 0
+        self.anchor = None
+        self.settled = False
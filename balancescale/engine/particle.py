@@ -0,0 +1,78 @@
+import numpy as np
+import pygame
+import pymunk
+from constants import *
+from render.sprites import get_particle_sprites
+
+class Particle:
+    def __init__(self, pos, n, space, mapper):
+        self.n = n % 11
+        self.radius = RADII[self.n]
+        self.body = pymunk.Body(body_type=pymunk.Body.DYNAMIC)
+        self.body.position = tuple(pos)
+        self.shape = pymunk.Circle(body=self.body, radius=self.radius)
+        self.shape.density = DENSITY
+        self.shape.elasticity = ELASTICITY
+        self.shape.collision_type = 1
+        self.shape.friction = 0.2
+        self.has_collided = False
+        self.store = None  # Set by ParticleStore.append
+        self.index = -1
+        self.generation = 0  # Bumped each time a pool hands it out again
+        mapper[self.shape] = self
+        if space is not None:  # None: the caller adds it, e.g. in one batch
+            space.add(self.body, self.shape)
+        self.alive = True
+
+    def reset(self, pos):
+        # Bring a pooled particle back as if it were new (body not in a space)
+        self.body.position = tuple(pos)
+        self.has_collided = False
+        self.store = None
+        self.index = -1
+        self.generation += 1
+        self.alive = True
+
+    def draw(self, screen):
+        # Prefer ParticleSprites.draw_all for many particles
+        if self.alive:
+            get_particle_sprites().draw_one(screen, self.n, self.body.position)
+
+    def kill(self, space):
+        space.remove(self.body, self.shape)
+        self.alive = False
+        if self.store is not None:
+            self.store.alive[self.index] = False
+
+    @property
+    def pos(self):
+        return np.array(self.body.position)
+
+class PreParticle:
+    def __init__(self, x, n):
+        self.n = n % 11
+        self.radius = RADII[self.n]
+        self.x = x
+
+    def draw(self, screen):
+        get_particle_sprites().draw_one(screen, self.n, (self.x, PAD[1] // 2))
+
+    def set_x(self, x):
+        lim = PAD[0] + self.radius + THICKNESS // 2
+        self.x = np.clip(x, lim, WIDTH - lim)
+
+    def layer_update(self):
+        # Compositor hook: (state, rects)
+        radius = self.radius + 1
+        rect = pygame.Rect(round(self.x) - radius, PAD[1] // 2 - radius, 2 * radius, 2 * radius)
+        return (rect.x, self.n), [rect]
+
+    def release(self, engine):
+        return engine.spawn((self.x, PAD[1] // 2), self.n)
+
+    def pour_region(self):
+        # Where the hopper drops while pouring: a short band under the preview
+        lim = PAD[0] + self.radius + THICKNESS // 2
+        left = max(self.x - POUR_WIDTH / 2, lim)
+        right = min(self.x + POUR_WIDTH / 2, WIDTH - lim)
+        return (left, PAD[1] // 4, right, PAD[1] // 2)
@@ -0,0 +1,63 @@
+from constants import *
+from engine.particle import Particle
+
+POOL_CAPACITY = 256  # Spare particles kept per size
+
+class ParticlePool:
+    """Recycles particle bodies and shapes, one free list per size index.
+
+    ``acquire`` hands back a pooled particle when one of that size is spare
+    and only builds a new body and shape otherwise. ``release`` takes a
+    particle that is already out of the space and resets its motion so it
+    comes back at rest.
+    """
+
+    def __init__(self, space, mapper, capacity=POOL_CAPACITY):
+        self.space = space
+        self.mapper = mapper
+        self.capacity = capacity
+        self.free = [[] for _ in range(11)]  # Same size wrap as Particle
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, pos, n, add=True):
+        # add=False leaves adding the body and shape to the space to the caller
+        free = self.free[n % 11]
+        if not free:
+            self.misses += 1
+            return Particle(pos, n, self.space if add else None, self.mapper)
+
+        self.hits += 1
+        particle = free.pop()
+        particle.reset(pos)
+        self.mapper[particle.shape] = particle
+        if add:
+            self.space.add(particle.body, particle.shape)
+        return particle
+
+    def release(self, particle):
+        free = self.free[particle.n]
+        if len(free) >= self.capacity:
+            return False
+        body = particle.body
+        body.velocity = (0, 0)
+        body.angular_velocity = 0
+        body.force = (0, 0)
+        body.torque = 0
+        body.angle = 0
+        body.activate()  # Zeroes the idle time, so it comes back awake
+        free.append(particle)
+        return True
+
+    def clear(self):
+        for free in self.free:
+            free.clear()
+
+    @property
+    def size(self):
+        return sum(len(free) for free in self.free)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
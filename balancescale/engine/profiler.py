@@ -0,0 +1,97 @@
+import csv
+import time
+import numpy as np
+from constants import *
+from utils import trace
+
+PHASES = ("events", "space_step", "weights", "scale_draw", "particle_draw", "ui_draw", "present")
+COUNTS = ("particles", "bodies", "arbiters")
+
+def arbiter_count(space):
+    # Contacts chipmunk is tracking; pymunk only exposes them privately
+    try:
+        return len(space._get_arbiters())
+    except AttributeError:
+        return 0
+
+class FrameProfiler:
+    """Per-phase frame timings in a fixed-size ring buffer.
+
+    Phases add their time to the current frame with ``add``; ``end_frame``
+    stores the row along with the frame's wall time and the particle, body
+    and arbiter counts, overwriting the oldest frame once the buffer is full.
+    Time not covered by any phase shows up as "other".
+    """
+
+    def __init__(self, capacity=PROFILE_FRAMES, phases=PHASES):
+        self.phases = phases
+        self.columns = {phase: i for i, phase in enumerate(phases)}
+        self.capacity = capacity
+        self.times = np.zeros((capacity, len(phases) + 1))  # Seconds; the last column is the frame
+        self.counts = np.zeros((capacity, len(COUNTS)), np.int64)
+        self.current = [0.0] * len(phases)
+        self.frames = 0  # Frames recorded since the start, including overwritten ones
+        self.frame_start = time.perf_counter()
+
+    def begin_frame(self):
+        self.current = [0.0] * len(self.phases)
+        self.frame_start = time.perf_counter()
+
+    def add(self, phase, seconds):
+        self.current[self.columns[phase]] += seconds
+        if trace.enabled:
+            trace.complete(phase, time.perf_counter() - seconds, seconds, "frame")
+
+    def end_frame(self, engine):
+        row = self.frames % self.capacity
+        self.times[row, :-1] = self.current
+        self.times[row, -1] = time.perf_counter() - self.frame_start
+        if trace.enabled:
+            trace.complete("frame", self.frame_start, self.times[row, -1], "frame")
+        self.counts[row] = (len(engine.particles), len(engine.space.bodies), arbiter_count(engine.space))
+        self.frames += 1
+
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    def recent(self):
+        # (times, counts) of the buffered frames, oldest first
+        if self.frames <= self.capacity:
+            return self.times[:self.frames], self.counts[:self.frames]
+        order = np.roll(np.arange(self.capacity), -(self.frames % self.capacity))
+        return self.times[order], self.counts[order]
+
+    def milliseconds(self):
+        # Per-frame ms for every phase plus "other" and "frame", oldest first
+        times, _ = self.recent()
+        ms = times * 1000
+        other = ms[:, -1] - ms[:, :-1].sum(axis=1)
+        return np.column_stack([ms[:, :-1], np.maximum(other, 0), ms[:, -1]])
+
+    @property
+    def names(self):
+        return self.phases + ("other", "frame")
+
+    def percentiles(self, q=(50, 95, 99)):
+        """{name: array of q-th percentile ms} over the buffered frames."""
+        if not len(self):
+            return {name: np.zeros(len(q)) for name in self.names}
+        ms = np.percentile(self.milliseconds(), q, axis=0)
+        return {name: ms[:, i] for i, name in enumerate(self.names)}
+
+    def latest_counts(self):
+        if not self.frames:
+            return dict.fromkeys(COUNTS, 0)
+        return dict(zip(COUNTS, self.counts[(self.frames - 1) % self.capacity].tolist()))
+
+    def export_csv(self, path):
+        """Write one row per buffered frame, oldest first. Returns the row count."""
+        ms = self.milliseconds()
+        _, counts = self.recent()
+        first = self.frames - len(ms)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame",) + tuple(f"{name}_ms" for name in self.names) + COUNTS)
+            for i, (row, count) in enumerate(zip(ms, counts)):
+                writer.writerow([first + i] + [f"{value:.4f}" for value in row] + count.tolist())
+        return len(ms)
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import struct
+import numpy as np
+import pygame
+from constants import *
+from engine.controls import Controls
+from engine.core import Engine
+
+# Log layout: magic, version, header length, JSON header, then fixed-size
+# records of (step, event type, x, y, button or key)
+LOG_MAGIC = b"DGEI"
+LOG_VERSION = 1
+PREAMBLE = struct.Struct("<4sHI")
+RECORD_DTYPE = np.dtype([("step", "<u4"), ("type", "<u2"), ("x", "<i2"), ("y", "<i2"), ("code", "<i4")])
+HASH_RECORD = 0xFFFF  # x, y and code hold an 8-byte state hash instead
+END_RECORD = 0xFFFE   # Last step of the session
+RECORDED_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.KEYDOWN)
+
+def state_hash(engine):
+    """8-byte digest of every particle's size and motion plus the scale's."""
+    digest = hashlib.blake2b(digest_size=8)
+    state = np.array([(p.n, *p.body.position, *p.body.velocity, p.body.angle, p.body.angular_velocity)
+                      for p in engine.particles if p.alive], dtype=np.float64)
+    digest.update(state.tobytes())
+    body = engine.scale_body
+    digest.update(np.array([body.angle, body.angular_velocity], dtype=np.float64).tobytes())
+    return digest.digest()
+
+def hash_code(digest):
+    # Pack a digest into the x, y and code fields of a record
+    record = np.zeros(1, RECORD_DTYPE)
+    record.view(np.uint8)[6:] = np.frombuffer(digest, np.uint8)
+    return record
+
+class InputRecorder:
+    """Writes the input events a Controls handles, with the step they came in.
+
+    The header keeps what a replay needs to rebuild the same engine: the
+    step rate, scale mode and the RNG state at the start. Every
+    ``hash_every`` steps a state hash is written too, to check replays against.
+    """
+
+    def __init__(self, path, engine, physics_hz=PHYSICS_HZ, substeps=PHYSICS_SUBSTEPS,
+                 scale_mode=SCALE_MODE, hash_every=REPLAY_HASH_EVERY):
+        self.hash_every = hash_every
+        self.file = open(path, "wb")
+        header = json.dumps({
+            "physics_hz": physics_hz,
+            "substeps": substeps,
+            "scale_mode": scale_mode,
+            "hash_every": hash_every,
+            "rng": engine.rng.bit_generator.state,
+        }).encode()
+        self.file.write(PREAMBLE.pack(LOG_MAGIC, LOG_VERSION, len(header)))
+        self.file.write(header)
+        self.record = np.zeros(1, RECORD_DTYPE)
+
+    def event(self, step, event):
+        if event.type not in RECORDED_EVENTS:
+            return
+        record = self.record
+        record["step"] = step
+        record["type"] = event.type
+        record["x"], record["y"] = getattr(event, "pos", (0, 0))
+        record["code"] = event.key if event.type == pygame.KEYDOWN else getattr(event, "button", 0)
+        self.file.write(record.tobytes())
+
+    def stepped(self, engine):
+        if self.hash_every and engine.steps % self.hash_every == 0:
+            record = hash_code(state_hash(engine))
+            record["step"] = engine.steps
+            record["type"] = HASH_RECORD
+            self.file.write(record.tobytes())
+
+    def close(self, engine):
+        if self.file.closed:
+            return
+        record = np.zeros(1, RECORD_DTYPE)
+        record["step"] = engine.steps
+        record["type"] = END_RECORD
+        self.file.write(record.tobytes())
+        self.file.close()
+
+def read_log(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = PREAMBLE.unpack_from(data)
+    if magic != LOG_MAGIC:
+        raise ValueError(f"{path} is not an input log")
+    if version != LOG_VERSION:
+        raise ValueError(f"unsupported input log version {version}")
+    header = json.loads(data[PREAMBLE.size:PREAMBLE.size + length])
+    records = np.frombuffer(data, RECORD_DTYPE, offset=PREAMBLE.size + length)
+    return header, records
+
+def to_event(record):
+    kind = int(record["type"])
+    if kind == pygame.KEYDOWN:
+        return pygame.event.Event(kind, key=int(record["code"]), mod=0)
+    pos = (int(record["x"]), int(record["y"]))
+    if kind == pygame.MOUSEMOTION:
+        return pygame.event.Event(kind, pos=pos)
+    return pygame.event.Event(kind, pos=pos, button=int(record["code"]))
+
+def replay(path, check=True):
+    """Run a recorded session headless, as fast as the CPU allows.
+
+    Returns (engine, mismatches), where mismatches lists the steps whose
+    state hash differs from the recording (always empty if check is False).
+    """
+    header, records = read_log(path)
+    engine = Engine(scale_mode=header["scale_mode"])
+    engine.rng.bit_generator.state = header["rng"]
+    controls = Controls(engine)
+    dt = 1 / header["physics_hz"]
+    substeps = header["substeps"]
+
+    mismatches = []
+    for record in records:
+        while engine.steps < record["step"]:
+            controls.step(dt, substeps)
+        kind = record["type"]
+        if kind == HASH_RECORD:
+            if check and record.tobytes()[6:] != state_hash(engine):
+                mismatches.append(int(record["step"]))
+        elif kind != END_RECORD:
+            controls.handle(to_event(record))
+    return engine, mismatches
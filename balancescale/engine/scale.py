@@ -0,0 +1,143 @@
+import math
+import pymunk
+from constants import *
+
+MAX_RADIANS = math.radians(MAX_ANGLE)
+SCALE_MODES = ("controller", "constraints")
+
+PLATE_WIDTH = 500
+PLATE_WALL_HEIGHT = 240
+PLATE_MASS = 50
+# Where the plates hang, in beam coordinates: the ends, just above the bar
+PLATE_ANCHORS = ((-SCALE_WIDTH // 2, -THICKNESS), (SCALE_WIDTH // 2, -THICKNESS))
+# The beam and the plates hung from it are separate bodies that overlap, so
+# they share a group to keep them from colliding with each other
+SCALE_FILTER = pymunk.ShapeFilter(group=1)
+
+def check_scale_mode(mode):
+    if mode not in SCALE_MODES:
+        raise ValueError(f"Scale mode must be one of {SCALE_MODES}, not {mode!r}")
+
+def create_scale(space, mode=SCALE_MODE):
+    check_scale_mode(mode)
+
+    # Create dynamic body for the scale
+    body = pymunk.Body(mass=1000, moment=pymunk.moment_for_segment(1000, (-SCALE_WIDTH//2, 0), (SCALE_WIDTH//2, 0), THICKNESS))
+    body.position = SCALE_POS
+
+    # Pin joint to fix the center in place while allowing rotation
+    joint = pymunk.PinJoint(space.static_body, body, (SCALE_POS[0], SCALE_POS[1]), (0, 0))
+
+    # Create the segment shape for the scale bar
+    shape = pymunk.Segment(body, (-SCALE_WIDTH//2, 0), (SCALE_WIDTH//2, 0), THICKNESS)
+    shape.friction = 0.5
+    shape.elasticity = ELASTICITY
+    shape.collision_type = 2
+
+    # Create the rectangular shape for the scale bar
+    scale_bar_shape = pymunk.Poly.create_box(body, (SCALE_WIDTH, THICKNESS))
+    scale_bar_shape.friction = 0.5
+    scale_bar_shape.elasticity = ELASTICITY
+    scale_bar_shape.collision_type = 2
+
+    shape.filter = scale_bar_shape.filter = SCALE_FILTER
+    space.add(body, shape, scale_bar_shape, joint)
+    plates = [create_plate(space, body, anchor) for anchor in PLATE_ANCHORS]
+
+    if mode == "constraints":
+        # Let the solver hold the tilt limit and pull the beam back to level,
+        # instead of torque writes and angle clamps from Python
+        limit = pymunk.RotaryLimitJoint(space.static_body, body, -MAX_RADIANS, MAX_RADIANS)
+        spring = pymunk.DampedRotarySpring(space.static_body, body, 0,
+                                           SCALE_SPRING_STIFFNESS, SCALE_SPRING_DAMPING)
+        space.add(limit, spring)
+
+    return body, shape, plates
+
+def create_plate(space, beam, anchor):
+    """A plate hung from the beam at anchor (beam coordinates).
+
+    Floor and walls are on a body of their own, on a PivotJoint at the
+    anchor, and a RotaryLimitJoint to the world keeps it level. The beam
+    only feels the plate through the pivot, so like a pan balance it tips by
+    how much is on each side, not where on the plate it rests.
+    """
+    body = pymunk.Body(mass=PLATE_MASS, moment=pymunk.moment_for_box(PLATE_MASS, (PLATE_WIDTH, PLATE_WALL_HEIGHT)))
+    body.position = beam.local_to_world(anchor)
+
+    half = PLATE_WIDTH // 2
+    floor = pymunk.Segment(body, (-half, 0), (half, 0), 5)
+    left_wall = pymunk.Segment(body, (-half, 0), (-half, -PLATE_WALL_HEIGHT), 5)
+    right_wall = pymunk.Segment(body, (half, 0), (half, -PLATE_WALL_HEIGHT), 5)
+    for part in (floor, left_wall, right_wall):
+        part.friction = 0.9
+        part.collision_type = 2
+        part.filter = SCALE_FILTER
+
+    pivot = pymunk.PivotJoint(beam, body, anchor, (0, 0))
+    level = pymunk.RotaryLimitJoint(space.static_body, body, 0, 0)
+    space.add(body, floor, left_wall, right_wall, pivot, level)
+    return body
+
+class ScalePhysics:
+    """Physics side of the scale: weighs the particles and tilts the beam."""
+
+    def __init__(self, body, mode=SCALE_MODE):
+        check_scale_mode(mode)
+        self.body = body
+        self.mode = mode
+        self.prev_angle = body.angle
+        self.alpha = 1.0  # Interpolation factor set by Engine.interpolate
+
+    def render_angle(self):
+        return self.prev_angle + (self.body.angle - self.prev_angle) * self.alpha
+
+    def calculate_weight_distribution(self, particles, load=None):
+        # particles is a ParticleStore: positions are refreshed in bulk and
+        # summed on its arrays. load is the (left, right) weight measured
+        # from contacts, if the engine has a plate sensor; then positions
+        # aren't needed at all
+        if load is not None:
+            left_weight, right_weight = float(load[0]), float(load[1])
+        else:
+            live = particles.refresh()
+            pos = particles.pos[live]
+            # Sum SIZE_VALUES weights on each side of the pivot. Particles
+            # off screen are culled once per step; until then they don't count
+            mass = particles.mass[live] * (pos[:, 1] <= HEIGHT)
+            left_weight = float(mass[pos[:, 0] < SCALE_POS[0]].sum())
+            right_weight = float(mass.sum()) - left_weight
+
+        # Joints do the rest in constraints mode
+        if self.mode == "constraints":
+            return left_weight, right_weight
+
+        # Calculate weight difference
+        weight_diff = left_weight - right_weight
+
+        # Improvements for more realistic physics:
+
+        # 1. Use more gentle angle mapping (0.2 instead of 0.5)
+        target_angle = min(max(weight_diff * 0.2, -MAX_RADIANS), MAX_RADIANS)
+
+        # 2. Apply physics with inertia - simulate real-world mechanics
+        current_angle = self.body.angle
+
+        # 3. Better damped target for smoother movement (more inertia)
+        damped_target = target_angle * 0.8 + current_angle * 0.7  # More influence from current position
+
+        # 4. Lower torque for more gradual movement
+        torque_value = (damped_target - current_angle) * 15000  # Reduced from 35000
+
+        # 5. Apply natural damping based on angular velocity
+        damping_torque = -self.body.angular_velocity * 5000  # Stronger damping
+
+        # Apply combined forces
+        self.body.torque = torque_value + damping_torque
+
+        # Keep hard limit on angle
+        if abs(self.body.angle) > MAX_RADIANS:
+            self.body.angle = math.copysign(MAX_RADIANS, self.body.angle)
+            self.body.angular_velocity = 0
+
+        return left_weight, right_weight
@@ -0,0 +1,75 @@
+import json
+import struct
+import numpy as np
+from constants import *
+from engine.history import pack_particles, unpack_particles
+from engine.timeline import KEYFRAME_DTYPE
+
+# File layout: magic, version, header length, JSON header, padding, then the
+# particle array (KEYFRAME_DTYPE rows) starting at header["offset"]
+SCENE_MAGIC = b"DGES"
+SCENE_VERSION = 1
+PREAMBLE = struct.Struct("<4sHI")
+ALIGN = 64
+
+def save_scene(engine, path):
+    particles = pack_particles(engine.particles, KEYFRAME_DTYPE)
+    body = engine.scale_body
+    header = {
+        "count": len(particles),
+        "dtype": KEYFRAME_DTYPE.descr,
+        "scale": [body.angle, body.angular_velocity],
+        "steps": engine.steps,
+    }
+    # The offset is part of the header, so settle its width first
+    header["offset"] = 0
+    size = PREAMBLE.size + len(json.dumps(header)) + 16
+    header["offset"] = -(-size // ALIGN) * ALIGN
+    data = json.dumps(header).encode()
+
+    with open(path, "wb") as f:
+        f.write(PREAMBLE.pack(SCENE_MAGIC, SCENE_VERSION, len(data)))
+        f.write(data)
+        f.write(b"\0" * (header["offset"] - f.tell()))
+        particles.tofile(f)
+    return len(particles)
+
+def read_scene(path):
+    """Header and a read-only memory map of the particle array.
+
+    Raises OSError if the file can't be read and ValueError if it isn't a
+    scene this version can load, before anything else is touched.
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) < PREAMBLE.size:
+            raise ValueError(f"{path} is not a scene file")
+        magic, version, length = PREAMBLE.unpack(preamble)
+        if magic != SCENE_MAGIC:
+            raise ValueError(f"{path} is not a scene file")
+        if version != SCENE_VERSION:
+            raise ValueError(f"unsupported scene version {version}")
+        header = json.loads(f.read(length))
+        size = f.seek(0, 2)
+    # JSON turns the descr's tuples into lists, so compare it the same way
+    if header.get("dtype") != json.loads(json.dumps(KEYFRAME_DTYPE.descr)):
+        raise ValueError(f"{path} holds particles in another layout")
+    for key in ("count", "offset", "scale", "steps"):
+        if key not in header:
+            raise ValueError(f"{path} has no {key!r} in its header")
+    count, offset = header["count"], header["offset"]
+    if offset + count * KEYFRAME_DTYPE.itemsize > size:
+        raise ValueError(f"{path} is truncated")
+    if not count:
+        return header, np.empty(0, KEYFRAME_DTYPE)
+    particles = np.memmap(path, KEYFRAME_DTYPE, mode="r", offset=offset, shape=(count,))
+    return header, particles
+
+def load_scene(engine, scene):
+    """Replace the engine's scene with a (header, particles) from read_scene."""
+    header, particles = scene
+    engine.clear()
+    unpack_particles(engine, particles)
+    engine.reset_scale(*header["scale"])
+    engine.scale.prev_angle = header["scale"][0]
+    return len(particles)
@@ -0,0 +1,93 @@
+import numpy as np
+from constants import *
+
+def sample_sizes(rng, count, weights=None):
+    """Draw count size indices. weights is one weight per size (uniform if None)."""
+    if weights is None:
+        return rng.integers(0, len(SIZE_VALUES), count)
+    weights = np.asarray(weights, dtype=float)
+    return rng.choice(len(weights), count, p=weights / weights.sum())
+
+def sample_positions(rng, sizes, region=DROP_REGION):
+    """Centers for particles of the given size indices in region, none overlapping.
+
+    Jittered rows: each row takes as many particles as fit across, with the
+    spare width split into random gaps; rows stack up from the bottom with
+    the spare height split the same way (and carry on above the top if they
+    don't all fit). Each particle sits at a random height within its row.
+    """
+    left, top, right, bottom = region
+    width = right - left
+    radii = np.asarray(RADII, dtype=float)[np.asarray(sizes, dtype=np.intp)]
+    rows = []
+    row, used = [], 0.0
+    for i, radius in enumerate(radii):
+        if row and used + 2 * radius > width:
+            rows.append(row)
+            row, used = [], 0.0
+        row.append(i)
+        used += 2 * radius
+    if row:
+        rows.append(row)
+
+    positions = np.empty((len(radii), 2))
+    heights = [2 * radii[row].max() for row in rows]
+    spare = max(bottom - top - sum(heights), 0)
+    y = bottom
+    for row, height, gap in zip(rows, heights, spare * rng.dirichlet(np.ones(len(rows) + 1))):
+        r = radii[row]
+        if len(row) == 1 and 2 * r[0] > width:
+            # Wider than the region: anywhere along it, as the center
+            x = rng.uniform(left, right, 1)
+        else:
+            gaps = max(width - 2 * r.sum(), 0) * rng.dirichlet(np.ones(len(row) + 1))[:-1]
+            x = left + np.cumsum(gaps + 2 * r) - r
+        y -= gap  # Bottom of this row
+        positions[row, 0] = x
+        positions[row, 1] = y - r - rng.uniform(0, 1, len(row)) * (height - 2 * r)
+        y -= height
+    return positions
+
+def drop(engine, count, weights=None, region=DROP_REGION):
+    """Spawn count particles at once, spread over region, using engine.rng."""
+    sizes = sample_sizes(engine.rng, count, weights)
+    positions = sample_positions(engine.rng, sizes, region)
+    return engine.spawn_many(positions.tolist(), sizes.tolist())
+
+class Hopper:
+    """Streams particles into the engine at ``rate`` per second.
+
+    Call ``update(dt)`` once per physics step, before ``engine.step``. Time
+    is accumulated so the rate holds whatever the step length is; each
+    update spawns its share in one batch.
+    """
+
+    def __init__(self, engine, rate=POUR_RATE, weights=None, region=DROP_REGION):
+        self.engine = engine
+        self.rate = rate
+        self.weights = weights
+        self.region = region
+        self.running = False
+        self.accumulator = 0.0
+        self.spawned = []  # Particles poured since the last start()
+
+    def start(self):
+        self.running = True
+        self.accumulator = 0.0
+        self.spawned = []
+
+    def stop(self):
+        self.running = False
+        return self.spawned
+
+    def update(self, dt):
+        if not self.running:
+            return []
+        self.accumulator += dt * self.rate
+        count = int(self.accumulator)
+        if not count:
+            return []
+        self.accumulator -= count
+        batch = drop(self.engine, count, self.weights, self.region)
+        self.spawned += batch
+        return batch
@@ -0,0 +1,171 @@
+import numpy as np
+from constants import *
+try:
+    from pymunk.batch import BodyFields, Buffer, get_space_bodies
+except ImportError:  # pymunk 6 has no batch API
+    get_space_bodies = None
+
+SIZE_MASS = np.array(SIZE_VALUES, dtype=float)
+
+class ParticleStore:
+    """List of particles backed by struct-of-arrays columns.
+
+    Behaves like the plain ``particles`` list (append, iterate) but also
+    keeps size index, mass, alive flag and position in NumPy arrays so the
+    per-step bookkeeping can be done with vector ops.
+
+    Given the ``space``, ``refresh`` reads every body position in one
+    ``pymunk.batch`` call and matches bodies to slots by body id.
+    """
+
+    def __init__(self, capacity=64, space=None):
+        self.items = []
+        self.bodies = []
+        self.space = space
+        self.buffer = None if get_space_bodies is None else Buffer()
+        self.lookup = None  # (sorted body ids, their slots), rebuilt after slots change
+        self.ids = np.zeros(capacity, dtype=np.uint64)
+        self.n = np.zeros(capacity, dtype=np.intp)
+        self.mass = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.alpha = 1.0  # Interpolation factor set by Engine.interpolate
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, i):
+        return self.items[i]
+
+    def _grow(self):
+        capacity = max(64, len(self.n) * 2)
+        for name in ("ids", "n", "mass", "alive", "pos", "prev_pos"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def append(self, particle):
+        i = len(self.items)
+        if i == len(self.n):
+            self._grow()
+        self.ids[i] = particle.body.id
+        self.n[i] = particle.n
+        self.mass[i] = SIZE_MASS[particle.n]
+        self.alive[i] = particle.alive
+        self.pos[i] = particle.body.position
+        self.prev_pos[i] = self.pos[i]
+        particle.store = self
+        particle.index = i
+        self.items.append(particle)
+        self.bodies.append(particle.body)
+        self.lookup = None
+
+    def clear(self):
+        for particle in self.items:
+            particle.store = None
+            particle.index = -1
+        self.alive[:len(self.items)] = False
+        self.items = []
+        self.bodies = []
+        self.lookup = None
+
+    def refresh(self):
+        # Pull positions of the live particles in one pass, return their slots
+        live = np.flatnonzero(self.alive[:len(self.items)])
+        if not live.size:
+            return live
+        if self.space is None or get_space_bodies is None:
+            bodies = self.bodies
+            self.pos[live] = [bodies[i].position for i in live]
+            return live
+
+        pos = self._read_bodies(BodyFields.POSITION, 2)
+        slots, found = self._match()
+        self.pos[slots] = pos[found]
+        return live
+
+    def motion(self, slots):
+        """Velocities, angles and angular velocities of the bodies in slots."""
+        if not len(slots):
+            return np.empty((0, 2)), np.empty(0), np.empty(0)
+        if self.space is None or get_space_bodies is None:
+            bodies = [self.bodies[i] for i in slots]
+            return ([body.velocity for body in bodies], [body.angle for body in bodies],
+                    [body.angular_velocity for body in bodies])
+        # Fields come in BodyFields order: angle, velocity, angular velocity
+        rows = self._read_bodies(BodyFields.ANGLE | BodyFields.VELOCITY | BodyFields.ANGULAR_VELOCITY, 4)
+        found_slots, found = self._match()
+        state = np.empty((len(self.items), 4))
+        state[found_slots] = rows[found]
+        state = state[slots]
+        return state[:, 1:3], state[:, 0], state[:, 3]
+
+    def _read_bodies(self, fields, width):
+        # One pymunk.batch call for every body in the space, width floats each
+        buffer = self.buffer
+        buffer.clear()
+        get_space_bodies(self.space, BodyFields.BODY_ID | fields, buffer)
+        return np.frombuffer(buffer.float_buf()).reshape(-1, width)
+
+    def _match(self):
+        # Slots of the bodies just read, and which of them are particles
+        ids = np.frombuffer(self.buffer.int_buf(), dtype=np.uint64)
+        if self.lookup is None:
+            count = len(self.items)
+            order = np.argsort(self.ids[:count])
+            self.lookup = (self.ids[order], order)
+        sorted_ids, order = self.lookup
+        # Bodies that aren't particles (the scale) match no slot
+        at = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        found = sorted_ids[at] == ids
+        return order[at[found]], found
+
+    def save_previous(self):
+        count = len(self.items)
+        self.prev_pos[:count] = self.pos[:count]
+
+    def render_pos(self, slots):
+        # Positions blended between the last two steps
+        if self.alpha >= 1.0:
+            return self.pos[slots]
+        prev = self.prev_pos[slots]
+        return prev + (self.pos[slots] - prev) * self.alpha
+
+    def cull(self, slots):
+        # Mark slots dead and mirror the flag onto the particle objects
+        self.alive[slots] = False
+        for i in slots:
+            self.items[i].alive = False
+
+    def compact(self):
+        # Drop dead slots, keeping the live ones in order. Returns the
+        # particles that were removed.
+        count = len(self.items)
+        alive = self.alive[:count]
+        if alive.all():
+            return []
+        keep = np.flatnonzero(alive)
+        first = int(np.argmin(alive))
+        dead = [self.items[i] for i in np.flatnonzero(~alive)]
+        k = keep.size
+        self.ids[:k] = self.ids[keep]
+        self.n[:k] = self.n[keep]
+        self.mass[:k] = self.mass[keep]
+        self.pos[:k] = self.pos[keep]
+        self.prev_pos[:k] = self.prev_pos[keep]
+        self.alive[:k] = True
+        self.alive[k:count] = False
+        self.items = [self.items[i] for i in keep]
+        self.bodies = [self.bodies[i] for i in keep]
+        self.lookup = None
+        for i in range(first, k):
+            self.items[i].index = i
+        for particle in dead:
+            particle.store = None
+            particle.index = -1
+        return dead
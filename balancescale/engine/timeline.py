@@ -0,0 +1,172 @@
+from collections import deque
+import numpy as np
+from constants import *
+from engine.history import pack_particles, unpack_particles
+
+# Like history.PARTICLE_DTYPE but full precision, so re-simulating from a
+# keyframe starts from the state the run actually had
+KEYFRAME_DTYPE = np.dtype([
+    ("n", np.uint8),
+    ("pos", np.float64, 2),
+    ("vel", np.float64, 2),
+    ("angle", np.float64),
+    ("spin", np.float64),
+])
+
+class Keyframe:
+    def __init__(self, controls):
+        engine = controls.engine
+        hopper = controls.hopper
+        self.step = engine.steps
+        self.particles = pack_particles(engine.particles, KEYFRAME_DTYPE)
+        # Undo and the pour in progress refer to particles by object, so keep
+        # them as rows of self.particles
+        slots = {particle: i for i, particle in enumerate(p for p in engine.particles if p.alive)}
+        self.history = controls.history.snapshot(slots)
+        self.spawned = [slots[particle] for particle in hopper.spawned if particle in slots]
+        self.scale = (engine.scale_body.angle, engine.scale_body.angular_velocity)
+        self.torque = engine.scale_body.torque  # Set after a step for the next one
+        self.rng = engine.rng.bit_generator.state
+        # The filtered plate load steers the scale, so it is state too
+        self.load = None if engine.plate_sensor is None else engine.plate_sensor.load.copy()
+        self.hopper = (hopper.running, hopper.accumulator, hopper.weights, hopper.region)
+
+    @property
+    def nbytes(self):
+        refs = len(self.spawned) + sum(len(added) for _, added in self.history[0])
+        return self.particles.nbytes + 256 + 8 * refs
+
+    def restore(self, controls):
+        engine = controls.engine
+        hopper = controls.hopper
+        engine.clear()
+        batch = unpack_particles(engine, self.particles)
+        controls.history.restore(self.history, batch)
+        hopper.spawned = [batch[i] for i in self.spawned]
+        engine.reset_scale(*self.scale)
+        engine.scale_body.torque = self.torque
+        engine.scale.prev_angle = self.scale[0]
+        engine.rng.bit_generator.state = self.rng
+        if self.load is not None:
+            engine.plate_sensor.load[:] = self.load
+        hopper.running, hopper.accumulator, hopper.weights, hopper.region = self.hopper
+        engine.steps = self.step
+
+class Timeline:
+    """Keyframes of the whole scene every ``every`` steps, for rewinding.
+
+    Keyframes are packed arrays in a ring bounded by count and bytes; the
+    input events between them are kept too. ``seek(step)`` restores the
+    nearest keyframe at or before ``step``, undo history included, and
+    re-simulates forward, replaying those events. Input while viewing the past is held back, and
+    the first physics step after it drops the old future, the way an
+    editor's redo does.
+    """
+
+    def __init__(self, controls, every=TIMELINE_EVERY, max_keyframes=TIMELINE_KEYFRAMES,
+                 max_bytes=TIMELINE_MAX_BYTES):
+        self.controls = controls
+        self.every = every
+        self.max_keyframes = max_keyframes
+        self.max_bytes = max_bytes
+        self.keyframes = deque()
+        self.events = deque()  # (step, event) since the oldest keyframe
+        self.pending = []      # Events that came in while viewing the past
+        self.nbytes = 0
+        self.rewound = False
+        self.seeking = False
+        self.latest = controls.engine.steps  # Furthest step reached
+        self.capture()  # Step 0, so there is always somewhere to go back to
+
+    def capture(self):
+        keyframe = Keyframe(self.controls)
+        self.keyframes.append(keyframe)
+        self.nbytes += keyframe.nbytes
+        while len(self.keyframes) > 1 and (len(self.keyframes) > self.max_keyframes
+                                           or self.nbytes > self.max_bytes):
+            self.nbytes -= self.keyframes.popleft().nbytes
+        oldest = self.keyframes[0].step
+        while self.events and self.events[0][0] < oldest:
+            self.events.popleft()
+        return keyframe
+
+    def branch(self, step):
+        # Time moves on from the past: forget what came after it
+        while self.keyframes[-1].step > step:
+            self.nbytes -= self.keyframes.pop().nbytes
+        while self.events and self.events[-1][0] > step:
+            self.events.pop()
+        self.events += self.pending
+        self.pending = []
+        self.latest = step
+        self.rewound = False
+
+    def event(self, step, event):
+        if self.seeking:
+            return
+        if self.rewound:
+            self.pending.append((step, event))
+        else:
+            self.events.append((step, event))
+
+    def stepped(self, engine):
+        if self.seeking:
+            return
+        if self.rewound:
+            self.branch(engine.steps - 1)
+        self.latest = engine.steps
+        if engine.steps % self.every == 0 and engine.steps > self.keyframes[-1].step:
+            self.capture()
+
+    @property
+    def start(self):
+        return self.keyframes[0].step
+
+    @property
+    def end(self):
+        return self.latest
+
+    def seek(self, step):
+        """Put the scene back the way it was after ``step`` and its input.
+
+        Returns the step reached.
+        """
+        controls = self.controls
+        step = min(max(step, self.start), self.end)
+        keyframe = self.keyframes[0]
+        for candidate in self.keyframes:
+            if candidate.step > step:
+                break
+            keyframe = candidate
+
+        self.pending = []
+        paused = controls.paused
+        self.seeking = True
+        try:
+            keyframe.restore(controls)
+            engine = controls.engine
+            events = [(s, e) for s, e in self.events if keyframe.step <= s <= step]
+            i = 0
+            while True:
+                while i < len(events) and events[i][0] == engine.steps:
+                    controls.handle(events[i][1])
+                    i += 1
+                if engine.steps >= step:
+                    break
+                controls.step(controls.dt, controls.substeps)
+        finally:
+            self.seeking = False
+            controls.paused = paused
+        self.rewound = step < self.end
+        return engine.steps
+
+    def previous(self):
+        # Back to the keyframe before the current step
+        step = self.controls.engine.steps
+        earlier = [k.step for k in self.keyframes if k.step < step]
+        return self.seek(earlier[-1] if earlier else self.start)
+
+    def next(self):
+        step = self.controls.engine.steps
+        later = [k.step for k in self.keyframes if k.step > step]
+        return self.seek(later[0] if later else self.end)
@@ -0,0 +1,36 @@
+from constants import *
+
+class FixedTimestep:
+    """Accumulates wall-clock time and hands it out as fixed physics steps.
+
+    Physics advances in steps of ``1 / physics_hz`` no matter how fast frames
+    are rendered. At most ``max_steps`` are run per frame; time beyond that
+    is dropped so a slow frame cannot snowball into slower ones. ``alpha`` is
+    how far the leftover time is into the next step, for interpolation.
+    """
+
+    def __init__(self, physics_hz=PHYSICS_HZ, substeps=PHYSICS_SUBSTEPS, max_steps=MAX_CATCH_UP_STEPS):
+        self.dt = 1 / physics_hz
+        self.substeps = substeps
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0  # Seconds discarded by the catch-up limit
+
+    def advance(self, elapsed):
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+        self.accumulator -= steps * self.dt
+        # Past the catch-up limit: keep only the fraction of a step
+        if self.accumulator >= self.dt:
+            self.dropped += self.accumulator - self.accumulator % self.dt
+            self.accumulator %= self.dt
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.dt
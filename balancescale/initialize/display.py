@@ -1,16 +1,35 @@
 import pygame
+from constants import WIDTH, HEIGHT
+from render.assets import assets
 
-# Set up the display and window's title
-width, height = 1920, 1080
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption('Balance Scale')
+# Created by init_display(), not at import
+screen = None
+background = None
 
-#Set the icon
-icon = pygame.image.load("balancescale/assets/images/Logo.png")
-pygame.display.set_icon(icon)
+def init_display():
+    """Open the window once and load the shared background; returns the screen."""
+    global screen, background
+    if screen is not None and pygame.display.get_surface() is screen:
+        return screen
+    pygame.init()
 
-#Set up background
-background = pygame.image.load('balancescale/assets/images/testbackground.jpg')
-background = pygame.transform.scale(background, (width, height))
-screen.blit(background, (0, 0))
-pygame.display.update()
\ No newline at end of file
+    # Set up the display and window's title
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption('Balance Scale')
+
+    #Set the icon
+    icon = assets.image("images/Logo.png")
+    pygame.display.set_icon(icon)
+
+    #Set up background
+    background = assets.scaled("images/testbackground.jpg", (WIDTH, HEIGHT))
+    screen.blit(background, (0, 0))
+    pygame.display.update()
+    return screen
+
+def set_cursor(cursor):
+    # Headless runs (dummy video driver) have no cursor to set
+    try:
+        pygame.mouse.set_cursor(cursor)
+    except pygame.error:
+        pass
@@ -1,17 +1,108 @@
+import importlib
 import pygame
 import time
 import math
-from initialize.display import screen, background
+from concurrent.futures import ThreadPoolExecutor
+from constants import *
+from initialize import display
+from render.assets import assets
+from scene_manager import Scene
+from utils import trace
 
-def loading_screen():
-    # Initialize Pygame
-    pygame.init()
+spacing = 15  # Increased spacing for larger text
 
-    # Background color
-    screen.fill((0, 0, 255))
+# What the simulation needs before it can start. Imports and image/font
+# decoding run on worker threads; anything that touches the display runs on
+# the main thread between frames once the workers are done.
+PRELOAD_MODULES = ("numpy", "pymunk", "engine.core", "engine.controls", "engine.replay",
+                   "render.compositor", "render.sprites", "simulation")
+PRELOAD_IMAGES = (
+    ("images/scalebase.png", (SCALE_WIDTH, SCALE_HEIGHT)),
+    ("images/Base.png", (500, 600)),
+    ("images/plate_left.png", (1500, 250)),
+    ("images/Button.png", BUTTON_SIZE),
+    ("images/Button.png", (BUTTON_SIZE[0] * 1.1, BUTTON_SIZE[1] * 1.1)),  # Hovered
+)
+PRELOAD_FONTS = (("fonts/MISHIMISHI-BLOCK.otf", 30), ("fonts/MISHIMISHI-BLOCK.otf", 72),
+                 (None, 36), (None, 24))
 
+class Preloader:
+    """Runs loading work while the loading screen keeps animating.
+
+    ``submit`` queues a task on the worker threads; ``then`` queues one for
+    the main thread, to run once every worker task has finished. ``pump``
+    is called once per frame: it collects finished workers and runs at most
+    one main-thread task. ``progress`` is the finished share of the work,
+    by weight.
+    """
+
+    def __init__(self, workers=PRELOAD_WORKERS):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="preload")
+        self.running = []     # (label, weight, future)
+        self.main_tasks = []  # (label, weight, fn)
+        self.results = {}
+        self.total = 0
+        self.finished = 0
+
+    def submit(self, label, fn, *args, weight=1):
+        self.running.append((label, weight, self.executor.submit(self.run, label, fn, *args)))
+        self.total += weight
+
+    def then(self, label, fn, weight=1):
+        self.main_tasks.append((label, weight, fn))
+        self.total += weight
+
+    def run(self, label, fn, *args):
+        with trace.span(label, "preload"):
+            return fn(*args)
+
+    def pump(self):
+        still_running = []
+        for label, weight, future in self.running:
+            if not future.done():
+                still_running.append((label, weight, future))
+                continue
+            self.finished += weight
+            if future.exception() is not None:
+                # Not fatal: the simulation loads it again itself and reports it there
+                print(f"Preloading {label} failed: {future.exception()}")
+            else:
+                self.results[label] = future.result()
+        self.running = still_running
+
+        if not self.running and self.main_tasks:
+            label, weight, fn = self.main_tasks.pop(0)
+            self.results[label] = self.run(label, fn)
+            self.finished += weight
+
+    @property
+    def progress(self):
+        return self.finished / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return not self.running and not self.main_tasks
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+def start_preload(warm_next):
+    # The simulation's imports, assets and sprites, then warm_next() to
+    # build the scene itself (engine, space and scale)
+    preloader = Preloader()
+    for module in PRELOAD_MODULES:
+        preloader.submit(f"import {module}", importlib.import_module, module, weight=2)
+    for name, size in PRELOAD_IMAGES:
+        preloader.submit(f"image {name}", assets.preload_image, name, size)
+    for name, size in PRELOAD_FONTS:
+        preloader.submit(f"font {name} {size}", assets.font, name, size)
+    preloader.then("sprites", lambda: importlib.import_module("render.sprites").get_particle_sprites())
+    preloader.then("scene", warm_next, weight=4)
+    return preloader
+
+def make_loading_text():
     # Set up font and text with increased size
-    font = pygame.font.Font("balancescale/assets/fonts/MISHIMISHI-BLOCK.otf", 192)
+    font = assets.font("fonts/MISHIMISHI-BLOCK.otf", 192)
     characters = list("ローディング")
     char_surfaces = []
     char_strokes = []
@@ -22,58 +113,87 @@ def loading_screen():
         char_stroke = font.render(char, True, (0, 0, 0))
         char_surfaces.append(char_text)
         char_strokes.append(char_stroke)
+    return char_surfaces, char_strokes
 
-    # Calculate total width of text
-    total_width = sum(surface.get_width() for surface in char_surfaces)
-    spacing = 15  # Increased spacing for larger text
-    total_width += spacing * (len(characters) - 1)
-    
-    # Set up animation parameters
-    char_bounce_offsets = [0] * len(characters)
+def draw_progress(screen, progress, size=(600, 24)):
+    rect = pygame.Rect((0, 0), size)
+    rect.center = (screen.get_width() // 2, screen.get_height() * 3 // 4)
+    pygame.draw.rect(screen, (0, 0, 0), rect.inflate(8, 8))
+    pygame.draw.rect(screen, (255, 255, 255), rect.inflate(4, 4), 2)
+    filled = rect.copy()
+    filled.width = round(rect.width * progress)
+    pygame.draw.rect(screen, (255, 255, 255), filled)
+
+def draw_loading(screen, current_time, char_surfaces, char_strokes, progress=None):
+    # One frame of the loading animation, current_time seconds in
     wave_speed = 2.0  # Controls the speed of the wave
     wave_amplitude = 40  # Controls the height of the bounce
     wave_frequency = 1.5  # Controls how spread out the wave is
 
-    # Animation loop
-    start_time = time.time()
-    while time.time() - start_time < 6.0:
-        current_time = time.time() - start_time
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-
-        # Clear screen and draw background
-        screen.blit(background, (0, 0))
-        
-        # Calculate starting X position to center the text
-        start_x = (screen.get_width() - total_width) // 2
-        current_x = start_x
-
-        # Update and render each character
-        for i in range(len(characters)):
-            # Calculate wave offset using sine function
-            phase = (current_time * wave_speed) - (i / wave_frequency)
-            char_bounce_offsets[i] = abs(math.sin(phase)) * wave_amplitude
-
-            # Draw character stroke with increased thickness
-            for dx, dy in [(-8, 0), (8, 0), (0, -8), (0, 8)]:
-                pos = (current_x + dx, 
-                      screen.get_height()//2 - char_strokes[i].get_height()//2 + dy - char_bounce_offsets[i])
-                screen.blit(char_strokes[i], pos)
-
-            # Draw main character
-            pos = (current_x,
-                  screen.get_height()//2 - char_surfaces[i].get_height()//2 - char_bounce_offsets[i])
-            screen.blit(char_surfaces[i], pos)
-
-            # Move to next character position
-            current_x += char_surfaces[i].get_width() + spacing
-
-        pygame.display.flip()
-        pygame.time.delay(16)
+    # Calculate total width of text
+    total_width = sum(surface.get_width() for surface in char_surfaces)
+    total_width += spacing * (len(char_surfaces) - 1)
+
+    # Clear screen and draw background
+    screen.blit(display.background, (0, 0))
+    
+    # Calculate starting X position to center the text
+    start_x = (screen.get_width() - total_width) // 2
+    current_x = start_x
+
+    # Update and render each character
+    for i in range(len(char_surfaces)):
+        # Calculate wave offset using sine function
+        phase = (current_time * wave_speed) - (i / wave_frequency)
+        bounce = abs(math.sin(phase)) * wave_amplitude
+
+        # Draw character stroke with increased thickness
+        for dx, dy in [(-8, 0), (8, 0), (0, -8), (0, 8)]:
+            pos = (current_x + dx, 
+                  screen.get_height()//2 - char_strokes[i].get_height()//2 + dy - bounce)
+            screen.blit(char_strokes[i], pos)
+
+        # Draw main character
+        pos = (current_x,
+              screen.get_height()//2 - char_surfaces[i].get_height()//2 - bounce)
+        screen.blit(char_surfaces[i], pos)
+
+        # Move to next character position
+        current_x += char_surfaces[i].get_width() + spacing
 
-    # Transition to simulation
-    import simulation
-    simulation.main()
\ No newline at end of file
+    if progress is not None:
+        draw_progress(screen, progress)
+
+class LoadingScene(Scene):
+    """Bouncing "ローディング" while the next scene is preloaded and warmed.
+
+    Switches to the next scene as soon as everything is loaded.
+    """
+
+    def __init__(self, next_scene="simulation"):
+        self.next_scene = next_scene
+        self.preloader = None
+
+    def init(self):
+        self.screen = display.init_display()
+        self.char_surfaces, self.char_strokes = make_loading_text()
+
+    def enter(self, manager):
+        self.preloader = start_preload(lambda: manager.warm(self.next_scene))
+        self.start_time = time.time()
+
+    def exit(self):
+        if self.preloader is not None:
+            self.preloader.close()
+            self.preloader = None
+
+    def frame(self, events):
+        # Work on the preload between frames
+        self.preloader.pump()
+        with trace.span("loading_frame", "frame"):
+            draw_loading(self.screen, time.time() - self.start_time, self.char_surfaces,
+                         self.char_strokes, self.preloader.progress)
+            pygame.display.flip()
+        if self.preloader.done:
+            return self.next_scene
+        pygame.time.delay(16)
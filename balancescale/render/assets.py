@@ -0,0 +1,122 @@
+import os
+import threading
+import pygame
+
+ASSET_DIR = "balancescale/assets"  # Relative to the repo root, like every other asset path
+
+class AssetManager:
+    """Loads each asset file once and shares it.
+
+    Images are converted to the display format as they are loaded (with
+    ``convert_alpha`` when the file has per-pixel alpha), so blits skip the
+    per-pixel conversion. Scaled copies are cached by (path, size), fonts by
+    (path, size). Names are relative to ``root`` and matched without regard
+    to case, so "button.png" and "Button.png" are the same file everywhere.
+
+    ``preload_image`` and ``font`` may be called from worker threads; the
+    display conversion of preloaded images waits for the main thread's
+    first ``image``/``scaled`` call. Each file is decoded once, however many
+    sizes are preloaded from it.
+
+    Cached surfaces are shared: ``copy()`` one before drawing onto it.
+    """
+
+    def __init__(self, root=ASSET_DIR):
+        self.root = root
+        self.paths = {}
+        self.images = {}
+        self.scaled_images = {}
+        self.fonts = {}
+        self.sounds = {}
+        self.decoded = {}  # (path, size) -> preloaded surface not yet converted
+        self.raw = {}      # path -> the file as decoded, for scaling more sizes from
+        self.decode_lock = threading.Lock()
+        self.font_lock = threading.Lock()  # FreeType can't open fonts on two threads at once
+
+    def path(self, name):
+        # Actual path of an asset, found case-insensitively
+        key = name.lower()
+        path = self.paths.get(key)
+        if path is None:
+            path = os.path.join(self.root, name)
+            if not os.path.exists(path):
+                folder, filename = os.path.split(path)
+                matches = [entry for entry in os.listdir(folder) if entry.lower() == filename.lower()]
+                if not matches:
+                    raise FileNotFoundError(f"No asset {name!r} in {self.root}")
+                path = os.path.join(folder, matches[0])
+            self.paths[key] = path
+        return path
+
+    def decode(self, path):
+        # Held while decoding, so two threads wanting one file decode it once
+        with self.decode_lock:
+            image = self.raw.get(path)
+            if image is None:
+                image = self.raw[path] = pygame.image.load(path)
+        return image
+
+    def preload_image(self, name, size=None):
+        # Decode (and scale) without touching the display, so it can run on a worker thread
+        path = self.path(name)
+        image = self.decode(path)
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            image = pygame.transform.scale(image, size)
+        self.decoded[(path, size)] = image
+
+    def display_format(self, image):
+        # Match the display format when there is one, so blits skip conversion
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+
+    def image(self, name):
+        path = self.path(name)
+        image = self.images.get(path)
+        if image is None:
+            image = self.decoded.pop((path, None), None)
+            if image is None:
+                image = self.decode(path)
+            image = self.images[path] = self.display_format(image)
+        return image
+
+    def scaled(self, name, size):
+        key = (self.path(name), (int(size[0]), int(size[1])))
+        image = self.scaled_images.get(key)
+        if image is None:
+            image = self.decoded.pop(key, None)
+            if image is not None:
+                image = self.display_format(image)
+            else:
+                image = pygame.transform.scale(self.image(name), key[1])
+            self.scaled_images[key] = image
+        return image
+
+    def font(self, name, size):
+        # name None is pygame's default font
+        path = None if name is None else self.path(name)
+        with self.font_lock:
+            font = self.fonts.get((path, size))
+            if font is None:
+                font = pygame.font.Font(path, size)
+                self.fonts[(path, size)] = font
+        return font
+
+    def sound(self, name):
+        path = self.path(name)
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+            self.sounds[path] = sound
+        return sound
+
+    def clear(self):
+        self.images.clear()
+        self.scaled_images.clear()
+        self.fonts.clear()
+        self.sounds.clear()
+        self.decoded.clear()
+        self.raw.clear()
+
+assets = AssetManager()
@@ -0,0 +1,128 @@
+import time
+import pygame
+
+MAX_DIRTY_RECTS = 16  # Above this many regions, repaint their union instead
+
+class Layer:
+    """Wraps two callables as a compositor layer.
+
+    ``update()`` returns ``(state, rects)`` for this frame: a comparable state
+    token and the screen rects the layer covers. It may also return a third
+    item, the exact rects that changed, when the layer can tell more precisely
+    than "old rects plus new rects". ``draw(screen)`` paints it. ``phase``
+    names the profiler phase the layer's time counts towards.
+    """
+
+    def __init__(self, draw, update, phase=None):
+        self.draw = draw
+        self.update = update
+        self.phase = phase
+
+def static_layer(draw, rect, phase=None):
+    rects = [pygame.Rect(rect)]
+    return Layer(draw, lambda: (None, rects), phase)
+
+def merge_rects(rects, bounds):
+    # Merge overlapping rects until none overlap, clipped to the screen
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width and rect.height:
+            merged.append(rect)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        while merged:
+            rect = merged.pop()
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                changed = True
+                i = rect.collidelist(merged)
+            result.append(rect)
+        merged = result
+    if len(merged) > MAX_DIRTY_RECTS:
+        merged = [merged[0].unionall(merged[1:])]
+    return merged
+
+class Compositor:
+    """Paints ordered layers over a cached background, only where they changed.
+
+    Each frame every layer reports its state and rects. A layer whose state or
+    rects changed marks both its old and new rects dirty. Only the dirty
+    regions are repainted (background, then every layer, clipped) and pushed
+    to the display with ``pygame.display.update(rects)``.
+    """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.layers = []
+        self.states = []
+        self.rects = []
+        self.dirty = []
+        self.full = True
+        self.profiler = None  # FrameProfiler; layer updates and draws are timed into it
+
+    def add(self, layer):
+        self.layers.append(layer)
+        self.states.append(object())  # Never equal, so the first frame paints it
+        self.rects.append([])
+        return layer
+
+    def invalidate(self):
+        self.full = True
+
+    def compose(self):
+        screen = self.screen
+        screen_rect = screen.get_rect()
+        dirty = []
+        profiler = self.profiler
+        for i, layer in enumerate(self.layers):
+            if profiler is not None and layer.phase:
+                start = time.perf_counter()
+                result = layer.update()
+                profiler.add(layer.phase, time.perf_counter() - start)
+            else:
+                result = layer.update()
+            state, rects = result[0], result[1]
+            changed = result[2] if len(result) > 2 else None
+            if state != self.states[i] or rects != self.rects[i]:
+                if changed is None:
+                    dirty += self.rects[i]
+                    dirty += rects
+                else:
+                    dirty += changed
+            self.states[i] = state
+            self.rects[i] = rects
+
+        if self.full:
+            dirty = [screen_rect]
+        elif dirty:
+            dirty = merge_rects(dirty, screen_rect)
+
+        for region in dirty:
+            screen.set_clip(region)
+            screen.blit(self.background, region, region)
+            for layer, rects in zip(self.layers, self.rects):
+                if region.collidelist(rects) == -1:
+                    continue
+                if profiler is not None and layer.phase:
+                    start = time.perf_counter()
+                    layer.draw(screen)
+                    profiler.add(layer.phase, time.perf_counter() - start)
+                else:
+                    layer.draw(screen)
+        screen.set_clip(None)
+
+        self.dirty = dirty
+        return dirty
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+            self.full = False
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.dirty = []
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import pygame
+from constants import MAX_ANGLE
+
+# A rotated beam is up to about 1.7 MB, so the step is coarse enough for every
+# angle in the tilt range to stay cached (41) without holding hundreds
+ROTATION_STEP = 0.5  # Degrees per cached angle
+ROTATION_CACHE_SIZE = round(2 * MAX_ANGLE / ROTATION_STEP) + 1  # Rotated surfaces kept per image
+
+class RotationCache:
+    """Rotated copies of one image, keyed on the angle rounded to ``step``.
+
+    Least recently used angles are dropped once ``maxsize`` is reached.
+    """
+
+    def __init__(self, image, step=ROTATION_STEP, maxsize=ROTATION_CACHE_SIZE):
+        self.image = image
+        self.step = step
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, angle):
+        return round(angle / self.step)
+
+    def angle_of(self, key):
+        return key * self.step
+
+    def rotate(self, key):
+        surface = pygame.transform.rotate(self.image, self.angle_of(key))
+        # Store in display format so the per-frame blit skips conversion
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def get(self, angle):
+        key = self.quantize(angle)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.rotate(key)
+        self.cache[key] = surface
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+        return surface
+
+    def prewarm(self, max_angle):
+        # Level and both limits first, where the scale comes to rest, then
+        # outward from 0, so the most common angles survive the LRU bound
+        limit = self.quantize(max_angle)
+        keys = [0, limit, -limit]
+        for k in range(1, limit):
+            keys += [k, -k]
+        for key in reversed(keys[:self.maxsize]):
+            if key not in self.cache:
+                self.cache[key] = self.rotate(key)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
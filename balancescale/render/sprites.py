@@ -0,0 +1,87 @@
+import numpy as np
+import pygame
+from constants import *
+
+SUPERSAMPLE = 4  # Draw each sprite this much larger, then smoothscale down for anti-aliasing
+
+def build_particle_sprite(n):
+    radius = RADII[n]
+    size = 2 * radius + 2
+    c1 = COLORS[n]
+    c2 = tuple(int(c * 0.8) for c in c1)
+
+    big = pygame.Surface((size * SUPERSAMPLE, size * SUPERSAMPLE), pygame.SRCALPHA)
+    center = (size * SUPERSAMPLE // 2, size * SUPERSAMPLE // 2)
+    pygame.draw.circle(big, c2, center, radius * SUPERSAMPLE)
+    pygame.draw.circle(big, c1, center, radius * 0.9 * SUPERSAMPLE)
+    sprite = pygame.transform.smoothscale(big, (size, size))
+
+    # Match the display format when there is one, so blits skip conversion
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    # RLE lets the opaque interior be copied and only the AA rim be blended
+    sprite.set_alpha(255, pygame.RLEACCEL)
+    return sprite
+
+class ParticleSprites:
+    """One pre-rendered two-tone sprite per size index, drawn in batches."""
+
+    def __init__(self):
+        self.sprites = [build_particle_sprite(n) for n in range(len(RADII))]
+        # Offset from particle center to sprite top-left, per size index
+        self.offsets = np.array([RADII[n] + 1 for n in range(len(RADII))], dtype=float)
+        self.sizes = np.array([sprite.get_width() for sprite in self.sprites])
+        self.batch = []
+        self.last = None  # (topleft, n) from the previous prepare()
+
+    def draw_one(self, screen, n, pos):
+        offset = self.offsets[n]
+        screen.blit(self.sprites[n], (round(pos[0] - offset), round(pos[1] - offset)))
+
+    def prepare(self, particles):
+        # particles is a ParticleStore; positions come from its last refresh.
+        # Builds the blit batch and returns (state, rects) for the compositor.
+        live = np.flatnonzero(particles.alive[:len(particles)])
+        if not live.size:
+            self.batch = []
+            self.last = None
+            return b"", []
+        n = particles.n[live]
+        topleft = np.rint(particles.render_pos(live) - self.offsets[n, None]).astype(int)
+        sprites = self.sprites
+        self.batch = [(sprites[i], xy) for i, xy in zip(n.tolist(), topleft.tolist())]
+
+        lo = topleft.min(axis=0)
+        hi = (topleft + self.sizes[n, None]).max(axis=0)
+        rects = [pygame.Rect(int(lo[0]), int(lo[1]), int(hi[0] - lo[0]), int(hi[1] - lo[1]))]
+        state = topleft.tobytes() + n.tobytes()
+
+        # Same particles as last frame: only the ones that moved are dirty
+        changed = None
+        last = self.last
+        if last is not None and np.array_equal(last[1], n):
+            moved = np.flatnonzero((last[0] != topleft).any(axis=1))
+            size = self.sizes[n[moved]].tolist()
+            changed = [pygame.Rect(x, y, w, w) for (x, y), w in zip(last[0][moved].tolist(), size)]
+            changed += [pygame.Rect(x, y, w, w) for (x, y), w in zip(topleft[moved].tolist(), size)]
+        self.last = (topleft, n)
+        return state, rects, changed
+
+    def draw_batch(self, screen):
+        fblits = getattr(screen, "fblits", None)  # pygame-ce only
+        if fblits is not None:
+            fblits(self.batch)
+        else:
+            screen.blits(self.batch, doreturn=False)
+
+    def draw_all(self, screen, particles):
+        self.prepare(particles)
+        self.draw_batch(screen)
+
+_particle_sprites = None
+
+def get_particle_sprites():
+    global _particle_sprites
+    if _particle_sprites is None:
+        _particle_sprites = ParticleSprites()
+    return _particle_sprites
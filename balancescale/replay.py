@@ -0,0 +1,23 @@
+# Replay a recorded input log headless: python balancescale/replay.py session.log
+import os
+import sys
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from engine.replay import replay
+
+def main(argv):
+    if not argv:
+        print("usage: replay.py LOG [--no-check]")
+        return 2
+    start = time.perf_counter()
+    engine, mismatches = replay(argv[0], check="--no-check" not in argv)
+    seconds = time.perf_counter() - start
+    print(f"{engine.steps} steps in {seconds:.2f}s ({engine.steps / max(seconds, 1e-9):.0f} steps/s), "
+          f"{len(engine.particles)} particles")
+    if mismatches:
+        print(f"state diverged at steps {mismatches}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
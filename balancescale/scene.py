@@ -0,0 +1,39 @@
+# Build or inspect scene files:
+#   python balancescale/scene.py build COUNT OUT [STEPS]
+#   python balancescale/scene.py info PATH
+import os
+import sys
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+from constants import *
+from engine.core import Engine
+from engine.scene_io import read_scene, save_scene
+from engine.spawner import drop
+
+def build(count, path, steps=0):
+    # Rain count random weights over the scale, optionally letting them fall
+    # for up to steps (whatever misses the scale is culled)
+    engine = Engine(seed=0)
+    drop(engine, count, region=(SCALE_LEFT, -count * 2, SCALE_RIGHT, PAD[1]))
+    for _ in range(steps):
+        engine.step(1 / PHYSICS_HZ, PHYSICS_SUBSTEPS)
+        if engine.settled:
+            break
+    saved = save_scene(engine, path)
+    print(f"{saved} particles after {engine.steps} steps saved to {path}")
+
+def info(path):
+    header, particles = read_scene(path)
+    print(f"{header['count']} particles, scale angle {header['scale'][0]:.4f}, saved at step {header['steps']}")
+
+def main(argv):
+    if len(argv) >= 3 and argv[0] == "build":
+        build(int(argv[1]), argv[2], *map(int, argv[3:4]))
+    elif len(argv) == 2 and argv[0] == "info":
+        info(argv[1])
+    else:
+        print("usage: scene.py build COUNT OUT [STEPS] | scene.py info PATH")
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
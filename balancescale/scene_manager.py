@@ -0,0 +1,108 @@
+import time
+import pygame
+from constants import *
+from utils import trace
+
+class Scene:
+    """One screen of the app (welcome, loading, simulation).
+
+    ``init`` does the one-time setup (window, assets, surfaces) on the first
+    ``warm``, which can happen well before the scene is shown, e.g. from the
+    loading screen. ``enter`` starts a visit and ``exit`` ends it, so a scene
+    can be shown again without being rebuilt. ``frame(events)`` runs one
+    frame and returns the name of the scene to switch to, or None to stay.
+    A scene sets ``idle`` when nothing will change until the next input.
+    """
+
+    ready = False
+    idle = False
+
+    def warm(self):
+        if not self.ready:
+            with trace.span(f"{type(self).__name__}.init", "scene"):
+                self.init()
+            self.ready = True
+        return self
+
+    def init(self):
+        pass
+
+    def enter(self, manager):
+        pass
+
+    def frame(self, events):
+        return None
+
+    def exit(self):
+        pass
+
+class SceneManager:
+    """Runs scenes one at a time from a single loop.
+
+    Scenes are registered by name with a factory (a Scene class, or a
+    function that imports the module and builds one), so nothing is imported
+    or loaded until a scene is first needed. The manager owns the clock, the
+    event queue and quitting; while the current scene is idle it blocks
+    until input arrives instead of running still frames.
+    """
+
+    def __init__(self, idle_wait_ms=IDLE_WAIT_MS):
+        self.factories = {}
+        self.scenes = {}
+        self.current = None
+        self.current_name = None
+        self.entered = None  # perf_counter() when the current scene was entered
+        self.clock = pygame.time.Clock()
+        self.idle_wait_ms = idle_wait_ms
+        self.pending = []  # Event that woke the loop from idle
+        self.running = False
+
+    def add(self, name, factory):
+        self.factories[name] = factory
+
+    def scene(self, name):
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = self.factories[name]()
+        return scene
+
+    def warm(self, name):
+        return self.scene(name).warm()
+
+    def leave(self):
+        self.current.exit()
+        trace.complete(self.current_name, self.entered, time.perf_counter() - self.entered, "scene")
+        self.current = None
+
+    def switch(self, name):
+        if self.current is not None:
+            self.leave()
+        self.entered = time.perf_counter()
+        self.current = self.warm(name)
+        self.current_name = name
+        with trace.span(f"{type(self.current).__name__}.enter", "scene"):
+            self.current.enter(self)
+
+    def run(self, name):
+        self.switch(name)
+        self.running = True
+        while self.running:
+            events = self.pending + pygame.event.get()
+            self.pending = []
+            if any(event.type == pygame.QUIT for event in events):
+                self.stop()
+                break
+            next_scene = self.current.frame(events)
+            if next_scene is not None:
+                self.switch(next_scene)
+            elif self.current.idle and not pygame.event.peek():
+                event = pygame.event.wait(self.idle_wait_ms)
+                if event.type != pygame.NOEVENT:
+                    self.pending.append(event)
+                self.clock.tick()  # Idle time is not frame time
+
+    def stop(self):
+        if self.current is not None:
+            self.leave()
+        self.running = False
+        pygame.quit()
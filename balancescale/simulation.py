@@ -1,221 +1,37 @@
+from utils import trace  # First, so that with tracing on the imports below are timed
 import pygame
-import sys
-import numpy as np
-import pymunk
 import time
 import math
 from constants import *
-from initialize.display import screen, background
-
-# Initialize Pygame
-pygame.init()
-rng = np.random.default_rng()
-
-# Get screen dimensions from the imported screen
-WIDTH = screen.get_width()
-HEIGHT = screen.get_height()
-
-# Constants
-PAD = (24, 160)
-A = (PAD[0], PAD[1])
-B = (PAD[0], HEIGHT - PAD[0])
-C = (WIDTH - PAD[0], HEIGHT - PAD[0])
-D = (WIDTH - PAD[0], PAD[1])
-BG_COLOR = (255, 240, 148)
-W_COLOR = (255, 190, 58)
-COLORS = [
-    (245, 0, 0),
-    (250, 100, 100),
-    (150, 20, 250),
-    (250, 210, 10),
-    (250, 150, 0),
-    (245, 0, 0),
-    (250, 250, 100),
-    (255, 180, 180),
-    (255, 255, 0),
-    (100, 235, 10),
-]
-
-FPS = 240
-RADII = [17, 25, 32, 38, 45, 55, 64, 75, 87, 100]  # Particle sizes
-THICKNESS = 15     # Wall thickness
-DENSITY = 0.01    # Particle density
-ELASTICITY = 0.2   # Bounce factor
-IMPULSE = 10000    # Force applied
-GRAVITY = 10000     # Gravity strength
-DAMPING = 1      # Energy loss factor
-NEXT_DELAY = FPS
-NEXT_STEPS = 30
-BIAS = 0.00001
-POINTS = [1, 3, 6, 10, 15, 21, 28, 36, 45, 55]
-WEIGHT_MULTIPLIER = 0.1  # Conversion factor for KG
-
-shape_to_particle = dict()
-
-# Define the specific size values
-SIZE_VALUES = [0.5, 1, 1.5, 2, 2.5, 3, 5, 7, 11, 16]
-
-class Particle:
-    def __init__(self, pos, n, space, mapper):
-        self.n = n % 11
-        self.radius = RADII[self.n]
-        self.body = pymunk.Body(body_type=pymunk.Body.DYNAMIC)
-        self.body.position = tuple(pos)
-        self.shape = pymunk.Circle(body=self.body, radius=self.radius)
-        self.shape.density = DENSITY
-        self.shape.elasticity = ELASTICITY
-        self.shape.collision_type = 1
-        self.shape.friction = 0.2
-        self.has_collided = False
-        mapper[self.shape] = self
-        space.add(self.body, self.shape)
-        self.alive = True
-
-    def draw(self, screen):
-        if self.alive:
-            c1 = np.array(COLORS[self.n])
-            c2 = (c1 * 0.8).astype(int)
-            pygame.draw.circle(screen, tuple(c2), self.body.position, self.radius)
-            pygame.draw.circle(screen, tuple(c1), self.body.position, self.radius * 0.9)
-
-    def kill(self, space):
-        space.remove(self.body, self.shape)
-        self.alive = False
-
-    @property
-    def pos(self):
-        return np.array(self.body.position)
-
-class PreParticle:
-    def __init__(self, x, n):
-        self.n = n % 11
-        self.radius = RADII[self.n]
-        self.x = x
-
-    def draw(self, screen):
-        c1 = np.array(COLORS[self.n])
-        c2 = (c1 * 0.8).astype(int)
-        pygame.draw.circle(screen, tuple(c2), (self.x, PAD[1] // 2), self.radius)
-        pygame.draw.circle(screen, tuple(c1), (self.x, PAD[1] // 2), self.radius * 0.9)
-
-    def set_x(self, x):
-        lim = PAD[0] + self.radius + THICKNESS // 2
-        self.x = np.clip(x, lim, WIDTH - lim)
-
-    def release(self, space, mapper):
-        return Particle((self.x, PAD[1] // 2), self.n, space, mapper)
-
-# Update these constants to make the scale bar larger
-SCALE_WIDTH = 900  # New width of the scale bar (700 + 40)
-SCALE_HEIGHT = 300 # Height of the scale bar remains the same
-SCALE_POS = (WIDTH // 2, HEIGHT // 2 + 50)  # Adjusted center position of the scale
-SCALE_LEFT = SCALE_POS[0] - SCALE_WIDTH // 2
-SCALE_RIGHT = SCALE_POS[0] + SCALE_WIDTH // 2
-MAX_ANGLE = 10  # Maximum tilt angle in degrees
-
-# Add this after the space initialization
-def create_scale(space): 
-    # Create dynamic body for the scale
-    body = pymunk.Body(mass=1000, moment=pymunk.moment_for_segment(1000, (-SCALE_WIDTH//2, 0), (SCALE_WIDTH//2, 0), THICKNESS))
-    body.position = SCALE_POS
-    
-    # Pin joint to fix the center in place while allowing rotation
-    joint = pymunk.PinJoint(space.static_body, body, (SCALE_POS[0], SCALE_POS[1]), (0, 0))
-    
-    # Create the segment shape for the scale bar
-    shape = pymunk.Segment(body, (-SCALE_WIDTH//2, 0), (SCALE_WIDTH//2, 0), THICKNESS)
-    shape.friction = 0.5
-    shape.elasticity = ELASTICITY
-    shape.collision_type = 2
-    
-    # Create the rectangular shape for the scale bar
-    scale_bar_shape = pymunk.Poly.create_box(body, (SCALE_WIDTH, THICKNESS))
-    scale_bar_shape.friction = 0.5
-    scale_bar_shape.elasticity = ELASTICITY
-    scale_bar_shape.collision_type = 2
-    
-    # EXPANDED: Make plates wider and walls higher
-    left_plate_width = 500  # Increased from 120
-    left_plate_height = 60   # Increased from 40
-    left_wall_height = 240   # Increased from 80
-    
-    # Left plate floor (horizontal barrier) - wider
-    left_plate_floor = pymunk.Segment(
-        body, 
-        (-SCALE_WIDTH//2 - left_plate_width//2, -THICKNESS), 
-        (-SCALE_WIDTH//2 + left_plate_width//2, -THICKNESS), 
-        5
-    )
-    left_plate_floor.friction = 0.9
-    
-    # Left plate left wall (vertical barrier) - taller
-    left_plate_left_wall = pymunk.Segment(
-        body, 
-        (-SCALE_WIDTH//2 - left_plate_width//2, -THICKNESS), 
-        (-SCALE_WIDTH//2 - left_plate_width//2, -THICKNESS - left_wall_height), 
-        5
-    )
-    left_plate_left_wall.friction = 0.9
-    
-    # Left plate right wall (vertical barrier) - taller
-    left_plate_right_wall = pymunk.Segment(
-        body, 
-        (-SCALE_WIDTH//2 + left_plate_width//2, -THICKNESS), 
-        (-SCALE_WIDTH//2 + left_plate_width//2, -THICKNESS - left_wall_height), 
-        5
-    )
-    left_plate_right_wall.friction = 0.9
-    
-    # EXPANDED: Right plate with same dimensions as left
-    right_plate_width = 500  # Increased from 120
-    
-    # Right plate floor (horizontal barrier) - wider
-    right_plate_floor = pymunk.Segment(
-        body, 
-        (SCALE_WIDTH//2 - right_plate_width//2, -THICKNESS), 
-        (SCALE_WIDTH//2 + right_plate_width//2, -THICKNESS), 
-        5
-    )
-    right_plate_floor.friction = 0.9
-    
-    # Right plate left wall (vertical barrier) - taller
-    right_plate_left_wall = pymunk.Segment(
-        body, 
-        (SCALE_WIDTH//2 - right_plate_width//2, -THICKNESS), 
-        (SCALE_WIDTH//2 - right_plate_width//2, -THICKNESS - left_wall_height), 
-        5
-    )
-    right_plate_left_wall.friction = 0.9
-    
-    # Right plate right wall (vertical barrier) - taller
-    right_plate_right_wall = pymunk.Segment(
-        body, 
-        (SCALE_WIDTH//2 + right_plate_width//2, -THICKNESS), 
-        (SCALE_WIDTH//2 + right_plate_width//2, -THICKNESS - left_wall_height), 
-        5
-    )
-    right_plate_right_wall.friction = 0.9
-    
-    # Add all shapes to the space
-    space.add(body, shape, scale_bar_shape, joint,
-              left_plate_floor, left_plate_left_wall, left_plate_right_wall,
-              right_plate_floor, right_plate_left_wall, right_plate_right_wall)
-    
-    return body, shape
-
-class Scale:
-    def __init__(self, body):
-        # Load the scale platform image
-        self.image = pygame.image.load("balancescale/assets/images/scalebase.png")
-        self.image = pygame.transform.scale(self.image, (SCALE_WIDTH, SCALE_HEIGHT))
+from initialize import display
+from initialize.display import set_cursor
+from engine.controls import Controls
+from engine.core import Engine
+from engine.profiler import FrameProfiler
+from engine.replay import InputRecorder
+from engine.scale import ScalePhysics
+from engine.scene_io import read_scene, save_scene
+from engine.timestep import FixedTimestep
+from render.assets import assets
+from render.compositor import Compositor, Layer, static_layer
+from render.rotation import RotationCache, ROTATION_STEP, ROTATION_CACHE_SIZE
+from render.sprites import get_particle_sprites
+from scene_manager import Scene, SceneManager
+
+class Scale(ScalePhysics):
+    def __init__(self, body, mode=SCALE_MODE, rotation_step=ROTATION_STEP,
+                 rotation_cache_size=ROTATION_CACHE_SIZE, prewarm=False):
+        super().__init__(body, mode)
+
+        # Load the scale platform image (scaled copies are shared between scales)
+        self.image = assets.scaled("images/scalebase.png", (SCALE_WIDTH, SCALE_HEIGHT))
         self.rect = self.image.get_rect(center=SCALE_POS)
         
         # Load the base image
         try:
-            self.base_image = pygame.image.load("balancescale/assets/images/Base.png")
             base_width = 500
             base_height = 600
-            self.base_image = pygame.transform.scale(self.base_image, (base_width, base_height))
+            self.base_image = assets.scaled("images/Base.png", (base_width, base_height))
             self.base_rect = self.base_image.get_rect(center=SCALE_POS)
         except Exception as e:
             print(f"Error loading base image: {e}")
@@ -226,10 +42,9 @@ class Scale:
         # Add left and right plates
         try:
             # Create smaller plates that will fit at the edges
-            self.plate_image = pygame.image.load("balancescale/assets/images/plate_left.png")
             plate_width = 1500  
             plate_height = 250  
-            self.plate_image = pygame.transform.scale(self.plate_image, (plate_width, plate_height))
+            self.plate_image = assets.scaled("images/plate_left.png", (plate_width, plate_height))
             
             # Position them EXACTLY at the left and right edges
             self.left_plate_pos = (SCALE_POS[0] - SCALE_WIDTH//2, SCALE_POS[1] - THICKNESS)
@@ -242,21 +57,31 @@ class Scale:
             self.plate_image.fill((200, 170, 100))  # Tan color for plates
             self.left_plate_pos = (SCALE_POS[0] - SCALE_WIDTH//2, SCALE_POS[1] - THICKNESS)
             self.right_plate_pos = (SCALE_POS[0] + SCALE_WIDTH//2, SCALE_POS[1] - THICKNESS)
-        
-        self.body = body
-        
-    def draw(self, screen):
-        # Get the angle from the physics body in degrees
-        angle_degrees = math.degrees(self.body.angle)
-        angle_rad = self.body.angle
+
+        # Rotated images are cached per quantized angle
+        self.cached_layout = None
+        self.image_rotations = RotationCache(self.image, rotation_step, rotation_cache_size)
+        if prewarm:
+            self.image_rotations.prewarm(MAX_ANGLE)
+
+    def rotation_key(self):
+        return self.image_rotations.quantize(-math.degrees(self.render_angle()))
+
+    def layout(self):
+        # Surfaces and rects to blit for the current angle, reused while the
+        # quantized angle stays the same
+        key = self.rotation_key()
+        if self.cached_layout is not None and self.cached_layout[0] == key:
+            return self.cached_layout[1]
+
+        # Get the angle from the physics body in degrees, snapped to the cache step
+        angle_degrees = -self.image_rotations.angle_of(key)
+        angle_rad = math.radians(angle_degrees)
         
         # Rotate the scale platform image
-        rotated_image = pygame.transform.rotate(self.image, -angle_degrees)
+        rotated_image = self.image_rotations.get(-angle_degrees)
         new_rect = rotated_image.get_rect(center=self.rect.center)
         
-        # Draw the scale platform first
-        screen.blit(rotated_image, new_rect.topleft)
-        
         # Calculate rotated positions for the plates
         # Left plate
         left_offset_x = self.left_plate_pos[0] - SCALE_POS[0]
@@ -270,338 +95,342 @@ class Scale:
         rotated_right_x = SCALE_POS[0] + right_offset_x * math.cos(angle_rad) - right_offset_y * math.sin(angle_rad)
         rotated_right_y = SCALE_POS[1] + right_offset_x * math.sin(angle_rad) + right_offset_y * math.cos(angle_rad)
         
-        # Rotate the plate images
-        rotated_plate = pygame.transform.rotate(self.plate_image, -angle_degrees)
-        
-        # Draw the plates
-        left_plate_rect = rotated_plate.get_rect(center=(rotated_left_x, rotated_left_y))
-        right_plate_rect = rotated_plate.get_rect(center=(rotated_right_x, rotated_right_y))
-        screen.blit(rotated_plate, left_plate_rect.topleft)
-        screen.blit(rotated_plate, right_plate_rect.topleft)
+        # The plates hang level, so they move with the beam but don't rotate
+        left_plate_rect = self.plate_image.get_rect(center=(rotated_left_x, rotated_left_y))
+        right_plate_rect = self.plate_image.get_rect(center=(rotated_right_x, rotated_right_y))
         
-        # Draw the base last (on top)
-        screen.blit(self.base_image, self.base_rect.topleft)
+        # Scale platform first, then the plates
+        blits = [
+            (rotated_image, new_rect),
+            (self.plate_image, left_plate_rect),
+            (self.plate_image, right_plate_rect),
+        ]
+        self.cached_layout = (key, blits)
+        return blits
 
-    def calculate_weight_distribution(self, particles):
-        left_weight = 0
-        right_weight = 0
-        center_x = SCALE_POS[0]
-        
-        # Calculate weights without the distance multiplier
-        for particle in particles:
-            if particle.alive:
-                # Check if particle is off screen
-                if particle.body.position.y > HEIGHT:
-                    particle.alive = False
-                    continue
-                    
-                # Get the actual weight from SIZE_VALUES
-                weight = SIZE_VALUES[particle.n]
-                
-                # Apply weight based on side
-                if particle.body.position.x < center_x:
-                    left_weight += weight
-                else:
-                    right_weight += weight
-        
-        # Calculate weight difference
-        weight_diff = left_weight - right_weight
-        
-        # Improvements for more realistic physics:
-        
-        # 1. Use more gentle angle mapping (0.2 instead of 0.5)
-        target_angle = np.clip(weight_diff * 0.2, -math.radians(MAX_ANGLE), math.radians(MAX_ANGLE))
-        
-        # 2. Apply physics with inertia - simulate real-world mechanics
-        current_angle = self.body.angle
-        
-        # 3. Better damped target for smoother movement (more inertia)
-        damped_target = target_angle * 0.8 + current_angle * 0.7  # More influence from current position
-        
-        # 4. Lower torque for more gradual movement
-        torque_value = (damped_target - current_angle) * 15000  # Reduced from 35000
-        
-        # 5. Apply natural damping based on angular velocity
-        damping_torque = -self.body.angular_velocity * 5000  # Stronger damping
-        
-        # Apply combined forces
-        self.body.torque = torque_value + damping_torque
-        
-        # Keep hard limit on angle
-        if abs(self.body.angle) > math.radians(MAX_ANGLE):
-            self.body.angle = math.copysign(math.radians(MAX_ANGLE), self.body.angle)
-            self.body.angular_velocity = 0
-        
-        return left_weight, right_weight
+    def draw(self, screen):
+        screen.blits(self.layout(), doreturn=False)
+        self.draw_base(screen)
+
+    def draw_beam(self, screen):
+        screen.blits(self.layout(), doreturn=False)
 
-# Create Pygame window
-pygame.display.set_caption("Balance Scale")
-clock = pygame.time.Clock()
-pygame.font.init()
+    def draw_base(self, screen):
+        # The base goes last (on top)
+        screen.blit(self.base_image, self.base_rect.topleft)
 
-space = pymunk.Space()
-space.gravity = (0, GRAVITY)
-space.damping = DAMPING
-space.collision_bias = BIAS
+    def layer_update(self):
+        # Compositor hook: (state, rects)
+        return self.rotation_key(), [rect for _, rect in self.layout()]
 
 # Constants for the button
 BUTTON_TEXT_COLOR = (255, 255, 255)  # White color for button text
-button_image = pygame.image.load("balancescale/assets/images/Button.png")  # Load button image once
-BUTTON_FONT = pygame.font.Font("balancescale/assets/fonts/MISHIMISHI-BLOCK.otf", 30)  # Load custom font
+BUTTON_IMAGE = "images/Button.png"
+BUTTON_FONT = ("fonts/MISHIMISHI-BLOCK.otf", 30)  # Custom font, loaded with the first button
 
 class ImageButton:
     def __init__(self, text, position, size):
         self.text = text
         self.position = position
         self.size = size
-        self.original_image = button_image
-        self.image = pygame.transform.scale(self.original_image, size)
+        self.image = assets.scaled(BUTTON_IMAGE, size)
         self.rect = self.image.get_rect(topleft=position)
-        self.font = BUTTON_FONT
+        self.font = assets.font(*BUTTON_FONT)
         self.hovered = False
+        self.rendered_text = None
         self.hand_cursor = pygame.SYSTEM_CURSOR_HAND
         self.arrow_cursor = pygame.SYSTEM_CURSOR_ARROW
 
-    def draw(self, screen):
-        mouse_pos = pygame.mouse.get_pos()
+    def update(self, mouse_pos=None):
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
         is_hovered = self.rect.collidepoint(mouse_pos)
         
         if is_hovered:
-            pygame.mouse.set_cursor(self.hand_cursor)
             if not self.hovered:
+                set_cursor(self.hand_cursor)  # Only on entering; it stays set
                 self.hovered = True
-                self.image = pygame.transform.scale(self.original_image, 
-                                                 (int(self.size[0] * 1.1), int(self.size[1] * 1.1)))
+                self.image = assets.scaled(BUTTON_IMAGE, (self.size[0] * 1.1, self.size[1] * 1.1))
                 self.rect = self.image.get_rect(center=self.rect.center)
         else:
             if self.hovered:
                 self.hovered = False
-                self.image = pygame.transform.scale(self.original_image, self.size)
+                self.image = assets.scaled(BUTTON_IMAGE, self.size)
                 self.rect = self.image.get_rect(topleft=self.position)
 
+        return is_hovered
+
+    def render(self, screen):
         # Draw the button background
         screen.blit(self.image, self.rect.topleft)
 
-        # Create text surfaces for stroke and main text
-        text_stroke = self.font.render(self.text, True, (0, 0, 0))  # Black stroke
-        text_main = self.font.render(self.text, True, BUTTON_TEXT_COLOR)  # White text
+        # Create text surfaces for stroke and main text, only when the text changes
+        if self.rendered_text != self.text:
+            self.text_stroke = self.font.render(self.text, True, (0, 0, 0))  # Black stroke
+            self.text_main = self.font.render(self.text, True, BUTTON_TEXT_COLOR)  # White text
+            self.rendered_text = self.text
 
         # Get text position
-        text_rect = text_main.get_rect(center=self.rect.center)
+        text_rect = self.text_main.get_rect(center=self.rect.center)
 
         # Draw stroke effect
         stroke_positions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
         for dx, dy in stroke_positions:
             stroke_pos = (text_rect.x + dx, text_rect.y + dy)
-            screen.blit(text_stroke, stroke_pos)
+            screen.blit(self.text_stroke, stroke_pos)
 
         # Draw main text
-        screen.blit(text_main, text_rect)
-        
+        screen.blit(self.text_main, text_rect)
+
+    def draw(self, screen, mouse_pos=None):
+        is_hovered = self.update(mouse_pos)
+        self.render(screen)
         return is_hovered
 
-# Modify the main game loop to handle paused state correctly
-def main():
-    # Add action history to track changes
-    action_history = []  # Stack of actions performed
-
-    # Calculate button dimensions for 4 buttons in a row
-    button_width = 180  # Narrower buttons to fit all four
-    button_height = 160  # Keep a good height for visibility
-    button_spacing = 20  # Spacing between buttons
-    button_y = HEIGHT - 180  # Position for all buttons
-    
-    # Change button labels to Japanese
-    start_button = ImageButton("スタート", (50, button_y), (button_width, button_height))
-    undo_button = ImageButton("アンドゥ", (50 + button_width + button_spacing, button_y), 
-                             (button_width, button_height))
-    stop_button = ImageButton("ストップ", (50 + (button_width + button_spacing) * 2, button_y), 
-                            (button_width, button_height))
-    reset_button = ImageButton("リセット", (50 + (button_width + button_spacing) * 3, button_y), 
-                             (button_width, button_height))
-
-    # Initialize game state
-    game_over = False
-    paused = False  # Track pause state
-    current_particle = PreParticle(WIDTH // 2, 0)
-    particles = []
-    dragging = False
-    selected_size = 0  # Initial size index
-    left_weight = 0
-    right_weight = 0
-    
-    # Create scale
-    scale_body, scale_shape = create_scale(space)
-    scale = Scale(scale_body)  # Pass the body to the Scale
-    
-    # Main game loop
-    while not game_over:
-        # Get current mouse position
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # REMOVE THE SECOND EVENT LOOP! Keep only one event handling section
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-                
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
-                    if start_button.rect.collidepoint(event.pos):
-                        print("Start button clicked")
-                        
-                        # Simply ensure the simulation is running (not paused)
-                        if paused:
-                            paused = False
-                            stop_button.text = "ストップ"  # Reset stop button text to "Pause"
-                        
-                        # No need to create balanced weights or clear particles
-                        # We just want the simulation to start/continue
-                        
-                    elif reset_button.rect.collidepoint(event.pos):
-                        print("Reset button clicked")
-                        # Save current state before resetting
-                        old_particles = particles.copy()
-                        old_angle = scale.body.angle
-                        
-                        # Reset everything
-                        for particle in particles:
-                            if particle.alive:
-                                particle.kill(space)
-                        particles = []
-                        current_particle = PreParticle(WIDTH // 2, 0)
-                        scale.body.angle = 0
-                        scale.body.angular_velocity = 0
-                        scale.body.torque = 0
-                        selected_size = 0
-                        
-                        # Record action for undo
-                        action_history.append({
-                            "type": "reset", 
-                            "particles": old_particles,
-                            "angle": old_angle,
-                            "size": selected_size
-                        })
-                        
-                    elif undo_button.rect.collidepoint(event.pos):
-                        print("Undo button clicked")
-                        if action_history:
-                            # Get the last action
-                            action = action_history.pop()
-                            
-                            # Handle different action types
-                            if action["type"] == "add_particle":
-                                # Remove the last added particle
-                                if particles:
-                                    last_particle = particles.pop()
-                                    if last_particle.alive:
-                                        last_particle.kill(space)
-                                        
-                            elif action["type"] == "clear" or action["type"] == "reset":
-                                # Clear current particles first
-                                for particle in particles:
-                                    if particle.alive:
-                                        particle.kill(space)
-                                particles = []
-                                
-                                # Restore old particles
-                                for old_particle in action["particles"]:
-                                    if old_particle.alive:
-                                        # Need to recreate the particles with same properties
-                                        new_particle = Particle(
-                                            old_particle.body.position, 
-                                            old_particle.n, 
-                                            space, 
-                                            shape_to_particle
-                                        )
-                                        particles.append(new_particle)
-                                
-                                # For reset actions, also restore angle
-                                if action["type"] == "reset":
-                                    scale.body.angle = action["angle"]
-                    
-                    elif stop_button.rect.collidepoint(event.pos):
-                        print("Stop button clicked")
-                        # Always pause the simulation when stop is clicked
-                        paused = True
-                        # No need to change button text since it's not toggling anymore
-                    
-                    # Only create particle if not clicking buttons
-                    elif not dragging:
-                        new_particle = current_particle.release(space, shape_to_particle)
-                        particles.append(new_particle)
-                        current_particle = PreParticle(mouse_pos[0], selected_size)
-                        
-                        # Record this add action
-                        action_history.append({"type": "add_particle"})
-                        
-                elif event.button == 3:  # Right click
-                    dragging = True
-                    
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if event.button == 3:
-                    dragging = False
-                    
-            elif event.type == pygame.MOUSEMOTION:
-                current_particle.set_x(mouse_pos[0])
-                
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    selected_size = (selected_size + 1) % len(SIZE_VALUES)
-                    current_particle = PreParticle(mouse_pos[0], selected_size)
-                elif event.key == pygame.K_DOWN:
-                    selected_size = (selected_size - 1) % len(SIZE_VALUES)
-                    current_particle = PreParticle(mouse_pos[0], selected_size)
-        
-        # Only update physics if not paused
-        if not paused:
-            space.step(1/FPS)
-            left_weight, right_weight = scale.calculate_weight_distribution(particles)
-        
-        # Drawing code remains the same
-        screen.fill(BG_COLOR)
-        
-        # Draw pause overlay when paused
-        if paused:
-            pause_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            pause_overlay.fill((0, 0, 0, 64))
-            screen.blit(pause_overlay, (0, 0))
-            
-            pause_font = pygame.font.Font("balancescale/assets/fonts/MISHIMISHI-BLOCK.otf", 72)
-            pause_text = pause_font.render("ストップ", True, (255, 255, 255))
-            text_rect = pause_text.get_rect(center=(WIDTH//2, HEIGHT//4))
-            screen.blit(pause_text, text_rect)
-            
-        # Rest of drawing code...
-        
-        # Draw everything
-        scale.draw(screen)
-        start_button.draw(screen)
-        reset_button.draw(screen)
-        undo_button.draw(screen)
-        stop_button.draw(screen)
-        
-        # Draw all particles
-        for particle in particles:
-            particle.draw(screen)
-        
-        # Draw current particle preview
-        current_particle.draw(screen)
-        
-        # Draw weight indicators
-        font = pygame.font.Font(None, 36)
-        left_text = font.render(f"Left: {left_weight:.1f} KG", True, (0, 0, 0))
-        right_text = font.render(f"Right: {right_weight:.1f} KG", True, (0, 0, 0))
-        screen.blit(left_text, (10, 50))
-        screen.blit(right_text, (WIDTH - 200, 50))
-        
-        # Draw size indicator
-        size_text = font.render(f"Weight: {SIZE_VALUES[selected_size]}", True, (0, 0, 0))
-        screen.blit(size_text, (10, 10))
-        
-        # Single display update
-        pygame.display.flip()
-        clock.tick(FPS)
+    def layer_update(self):
+        # Compositor hook: (state, rects)
+        self.update()
+        return (self.hovered, self.text), [self.rect.inflate(4, 4)]
+
+class PauseOverlay:
+    def __init__(self):
+        # Built once instead of every paused frame
+        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 64))
+        pause_font = assets.font("fonts/MISHIMISHI-BLOCK.otf", 72)
+        self.text = pause_font.render("ストップ", True, (255, 255, 255))
+        self.text_rect = self.text.get_rect(center=(WIDTH//2, HEIGHT//4))
+
+    def draw(self, screen):
+        screen.blit(self.overlay, (0, 0))
+        screen.blit(self.text, self.text_rect)
+
+class WeightDisplay:
+    def __init__(self):
+        self.font = assets.font(None, 36)
+        self.values = None
+        self.blits = []
+
+    def update(self, left_weight, right_weight, selected_size):
+        # Re-render the text only when the numbers change
+        values = (f"{left_weight:.1f}", f"{right_weight:.1f}", selected_size)
+        if values != self.values:
+            self.values = values
+            left_text = self.font.render(f"Left: {values[0]} KG", True, (0, 0, 0))
+            right_text = self.font.render(f"Right: {values[1]} KG", True, (0, 0, 0))
+            size_text = self.font.render(f"Weight: {SIZE_VALUES[selected_size]}", True, (0, 0, 0))
+            self.blits = [
+                (left_text, left_text.get_rect(topleft=(10, 50))),
+                (right_text, right_text.get_rect(topleft=(WIDTH - 200, 50))),
+                (size_text, size_text.get_rect(topleft=(10, 10))),
+            ]
+        return values, [rect for _, rect in self.blits]
+
+    def draw(self, screen):
+        screen.blits(self.blits, doreturn=False)
+
+class ProfilerOverlay:
+    """Percentile table of the frame profiler, refreshed every few frames."""
+
+    def __init__(self, profiler, fps=RENDER_FPS, topleft=(WIDTH - 420, 90)):
+        self.profiler = profiler
+        self.budget = 1000 / fps
+        self.font = assets.font(None, 24)
+        self.topleft = topleft
+        self.visible = False
+        self.state = None
+        self.surface = None
+        self.rect = pygame.Rect(topleft, (0, 0))
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.state = None
+
+    def render(self):
+        percentiles = self.profiler.percentiles()
+        counts = self.profiler.latest_counts()
+        budget = self.budget
+        rows = [("ms", "p50", "p95", "p99")]
+        for name, values in percentiles.items():
+            rows.append((name,) + tuple(f"{value:.2f}" for value in values))
+        columns = (0, 150, 230, 310)
+        line = self.font.get_linesize()
+        self.surface = pygame.Surface((390, line * (len(rows) + 2) + 10), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 160))
+        for i, row in enumerate(rows):
+            over = i and row[0] == "frame" and float(row[3]) > budget
+            color = (255, 90, 90) if over else (255, 255, 255)
+            for x, text in zip(columns, row):
+                self.surface.blit(self.font.render(text, True, color), (x + 8, i * line + 5))
+        summary = [f"budget {budget:.1f} ms, {len(self.profiler)} frames",
+                   "  ".join(f"{name} {count}" for name, count in counts.items())]
+        for i, text in enumerate(summary):
+            self.surface.blit(self.font.render(text, True, (255, 255, 255)), (8, (len(rows) + i) * line + 5))
+        self.rect = self.surface.get_rect(topleft=self.topleft)
+
+    def update(self):
+        if not self.visible:
+            return None, []
+        state = self.profiler.frames // PROFILE_REFRESH
+        if state != self.state:
+            self.state = state
+            self.render()
+        return state, [self.rect]
+
+    def draw(self, screen):
+        screen.blit(self.surface, self.rect)
+
+def export_profile(profiler):
+    path = time.strftime(PROFILE_CSV)
+    print(f"Wrote {profiler.export_csv(path)} frames to {path}")
+
+class SimulationScene(Scene):
+    """The balance scale game itself.
+
+    ``init`` builds the engine (unless one is passed in), the buttons and
+    the compositor layers; ``enter`` starts a session (recorder, timestep)
+    and ``exit`` ends it.
+    """
+
+    def __init__(self, physics_hz=PHYSICS_HZ, substeps=PHYSICS_SUBSTEPS, max_catch_up=MAX_CATCH_UP_STEPS,
+                 render_fps=RENDER_FPS, scale_mode=SCALE_MODE, record=INPUT_LOG, engine=None):
+        self.physics_hz = physics_hz
+        self.substeps = substeps
+        self.max_catch_up = max_catch_up
+        self.render_fps = render_fps
+        self.scale_mode = scale_mode
+        self.record = record
+        self.engine = engine
+
+    def init(self):
+        screen = display.init_display()
+        # Create the physics engine and the scale, unless the loading screen already has
+        if self.engine is None:
+            self.engine = Engine(scale_cls=Scale, scale_mode=self.scale_mode)
+        engine = self.engine
+        scale = engine.scale
+        # Game rules live in Controls so a recorded session can be replayed headless
+        controls = self.controls = Controls(engine)
+
+        # Change button labels to Japanese
+        labels = {"start": "スタート", "undo": "アンドゥ", "stop": "ストップ", "reset": "リセット"}
+        buttons = {name: ImageButton(labels[name], rect.topleft, rect.size)
+                   for name, rect in controls.rects.items()}
+        sprites = get_particle_sprites()  # Build the particle sprites up front
+
+        # Layers, bottom to top. The background is cached once and each layer
+        # reports what it covers, so only regions that changed get repainted
+        background_layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background_layer.fill(BG_COLOR)
+        compositor = self.compositor = Compositor(screen, background_layer)
+        pause_overlay = PauseOverlay()
+        weight_display = WeightDisplay()
+        compositor.add(Layer(pause_overlay.draw,
+                             lambda: (controls.paused, [screen.get_rect()] if controls.paused else []),
+                             "ui_draw"))
+        compositor.add(Layer(scale.draw_beam, scale.layer_update, "scale_draw"))
+        compositor.add(static_layer(scale.draw_base, scale.base_rect, "scale_draw"))
+        for name in ("start", "reset", "undo", "stop"):
+            compositor.add(Layer(buttons[name].render, buttons[name].layer_update, "ui_draw"))
+        compositor.add(Layer(sprites.draw_batch, lambda: sprites.prepare(engine.particles), "particle_draw"))
+        compositor.add(Layer(lambda screen: controls.current_particle.draw(screen),
+                             lambda: controls.current_particle.layer_update(), "particle_draw"))
+        compositor.add(Layer(weight_display.draw,
+                             lambda: weight_display.update(controls.left_weight, controls.right_weight,
+                                                           controls.selected_size), "ui_draw"))
+
+        # Every frame is timed by phase into a ring buffer; F3 shows it, F4 saves it
+        self.profiler = engine.profiler = compositor.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.render_fps)
+        compositor.add(Layer(self.profiler_overlay.draw, self.profiler_overlay.update))
+
+    def enter(self, manager):
+        self.clock = manager.clock
+        self.recorder = None
+        if self.record:
+            self.recorder = self.controls.recorder = InputRecorder(
+                self.record, self.engine, self.physics_hz, self.substeps, self.engine.scale.mode)
+        self.timestep = FixedTimestep(self.physics_hz, self.substeps, self.max_catch_up)
+        self.elapsed = 0.0
+        self.idle = False
+        self.compositor.invalidate()  # Another scene drew over the screen
+
+    def exit(self):
+        self.stop_recording()
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close(self.engine)
+            self.recorder = self.controls.recorder = None
+
+    def load_scene(self, path=SCENE_FILE):
+        try:
+            scene = read_scene(path)
+        except (OSError, ValueError) as e:
+            print(f"Couldn't load a scene from {path}: {e}")
+            return
+        # Scene files are read from disk outside the input log, so a replay
+        # couldn't reproduce what follows: the recording ends here
+        if self.recorder is not None:
+            print(f"Input log stopped at step {self.engine.steps}: scene loaded from {path}")
+            self.stop_recording()
+        self.controls.load(path, scene)
+
+    def frame(self, events):
+        controls = self.controls
+        profiler = self.profiler
+        profiler.begin_frame()
+        start = time.perf_counter()
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler_overlay.toggle()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                export_profile(profiler)
+                continue
+            # Saving and loading touch files, so they stay out of Controls
+            # and out of what is recorded and replayed
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                print(f"Saved {save_scene(self.engine, SCENE_FILE)} particles to {SCENE_FILE}")
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                self.load_scene()
+                continue
+            controls.handle(event)
+        profiler.add("events", time.perf_counter() - start)
+        
+        # Only update physics if not paused. Physics runs in fixed steps
+        # paid for by the time the last frame took.
+        timestep = self.timestep
+        if not controls.paused:
+            for _ in range(timestep.advance(self.elapsed)):
+                controls.step(timestep.dt, timestep.substeps)
+            self.engine.interpolate(timestep.alpha)
+        else:
+            timestep.reset()
+        
+        # Repaint only the layers that changed and push just those regions
+        self.compositor.compose()
+        start = time.perf_counter()
+        self.compositor.present()
+
+        # Nothing is moving: the manager blocks until input arrives instead
+        # of stepping and redrawing a still scene
+        self.idle = not controls.busy and not controls.dragging
+        if self.idle:
+            self.elapsed = 0.0
+        else:
+            self.elapsed = self.clock.tick(self.render_fps) / 1000
+        profiler.add("present", time.perf_counter() - start)
+        profiler.end_frame(self.engine)  # The idle wait is not part of any frame
+
+def main(physics_hz=PHYSICS_HZ, substeps=PHYSICS_SUBSTEPS, max_catch_up=MAX_CATCH_UP_STEPS,
+         render_fps=RENDER_FPS, scale_mode=SCALE_MODE, record=INPUT_LOG, engine=None):
+    # Just the game, without the welcome and loading screens
+    manager = SceneManager()
+    manager.add("simulation", lambda: SimulationScene(physics_hz, substeps, max_catch_up, render_fps,
+                                                      scale_mode, record, engine))
+    manager.run("simulation")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
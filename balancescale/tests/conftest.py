@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The game imports its modules from balancescale/, like the scripts run there
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
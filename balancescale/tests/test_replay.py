@@ -0,0 +1,46 @@
+import pygame
+from constants import *
+from engine.controls import Controls
+from engine.core import Engine
+from engine.replay import HASH_RECORD, InputRecorder, read_log, replay, state_hash
+
+def click(controls, pos):
+    controls.handle(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+
+def press(controls, button):
+    click(controls, controls.rects[button].center)
+
+def key(controls, key):
+    controls.handle(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0))
+
+def run(controls, steps):
+    for _ in range(steps):
+        controls.step(1 / PHYSICS_HZ, PHYSICS_SUBSTEPS)
+
+def test_replay_matches_recording(tmp_path):
+    path = tmp_path / "session.log"
+    engine = Engine(seed=4)
+    controls = Controls(engine)
+    controls.recorder = InputRecorder(path, engine, hash_every=30)
+
+    click(controls, (WIDTH // 2 - 200, 200))
+    run(controls, 60)
+    key(controls, pygame.K_b)  # Drop a batch
+    run(controls, 90)
+    key(controls, pygame.K_p)  # Pour for a while
+    run(controls, 120)
+    key(controls, pygame.K_p)
+    run(controls, 60)
+    press(controls, "reset")
+    run(controls, 30)
+    press(controls, "undo")  # Brings the scene back
+    run(controls, 120)
+    controls.recorder.close(engine)
+    assert any(particle.alive for particle in engine.particles)
+
+    _, records = read_log(path)
+    assert (records["type"] == HASH_RECORD).sum() == engine.steps // 30
+    replayed, mismatches = replay(path)
+    assert mismatches == []
+    assert replayed.steps == engine.steps
+    assert state_hash(replayed) == state_hash(engine)
@@ -0,0 +1,44 @@
+import json
+import numpy as np
+import pytest
+from constants import *
+from engine.controls import Controls
+from engine.core import Engine
+from engine.history import pack_particles
+from engine.scene_io import PREAMBLE, SCENE_MAGIC, SCENE_VERSION, read_scene, save_scene
+from engine.spawner import drop
+from engine.timeline import KEYFRAME_DTYPE
+
+def scene_engine():
+    engine = Engine(seed=2)
+    drop(engine, 40)
+    engine.run(120, 1 / PHYSICS_HZ, PHYSICS_SUBSTEPS)
+    return engine
+
+def test_scene_round_trip(tmp_path):
+    path = tmp_path / "scene.dge"
+    engine = scene_engine()
+    saved = pack_particles(engine.particles, KEYFRAME_DTYPE)
+    assert save_scene(engine, path) == len(saved) > 0
+
+    controls = Controls(Engine(seed=3))
+    assert controls.load(path) == len(saved)
+    loaded = controls.engine
+    assert np.array_equal(pack_particles(loaded.particles, KEYFRAME_DTYPE), saved)
+    assert loaded.scale_body.angle == engine.scale_body.angle
+    assert loaded.scale_body.angular_velocity == engine.scale_body.angular_velocity
+
+def test_missing_scene_leaves_engine_alone(tmp_path):
+    controls = Controls(scene_engine())
+    before = pack_particles(controls.engine.particles, KEYFRAME_DTYPE)
+    with pytest.raises(FileNotFoundError):
+        controls.load(tmp_path / "missing.dge")
+    assert np.array_equal(pack_particles(controls.engine.particles, KEYFRAME_DTYPE), before)
+
+def test_scene_with_other_layout_is_refused(tmp_path):
+    path = tmp_path / "old.dge"
+    header = json.dumps({"count": 0, "dtype": [["n", "|u1"], ["pos", "<f4", [2]]],
+                         "scale": [0, 0], "steps": 0, "offset": 0}).encode()
+    path.write_bytes(PREAMBLE.pack(SCENE_MAGIC, SCENE_VERSION, len(header)) + header)
+    with pytest.raises(ValueError):
+        read_scene(path)
@@ -0,0 +1,60 @@
+import pygame
+from constants import *
+from engine.controls import Controls
+from engine.core import Engine
+
+def click(controls, pos):
+    controls.handle(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos))
+
+def press(controls, button):
+    click(controls, controls.rects[button].center)
+
+def key(controls, key):
+    controls.handle(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+def run(controls, steps):
+    for _ in range(steps):
+        controls.step(1 / PHYSICS_HZ, PHYSICS_SUBSTEPS)
+
+def live(engine):
+    return sum(particle.alive for particle in engine.particles)
+
+def test_seek_keeps_history():
+    controls = Controls(Engine(seed=1))
+    engine = controls.engine
+    click(controls, (WIDTH // 2 - 100, 200))
+    click(controls, (WIDTH // 2 + 100, 200))
+    run(controls, 600)
+    press(controls, "reset")
+    run(controls, 30)
+    press(controls, "stop")
+
+    # Scrub back over the reset and forward again: replaying it must not
+    # record a second reset
+    for k in (pygame.K_LEFT, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_RIGHT):
+        key(controls, k)
+    assert [command.kind for command in controls.history.commands] == ["add", "add", "reset"]
+    assert live(engine) == 0
+
+    press(controls, "undo")  # Brings back both particles, still paused
+    press(controls, "undo")
+    assert live(engine) == 2
+
+def test_undo_after_seek():
+    controls = Controls(Engine(seed=1))
+    engine = controls.engine
+    click(controls, (WIDTH // 2 - 100, 200))
+    click(controls, (WIDTH // 2 + 100, 200))
+    run(controls, 150)
+    press(controls, "stop")
+    key(controls, pygame.K_LEFT)
+    key(controls, pygame.K_RIGHT)
+    assert engine.steps == 150
+    assert len(controls.history) == 2
+
+    # The seek respawned both particles; the adds must still undo them,
+    # paused or not
+    press(controls, "undo")
+    assert live(engine) == 1
+    press(controls, "undo")
+    assert live(engine) == 0
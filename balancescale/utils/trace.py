@@ -0,0 +1,155 @@
+"""Span tracer that writes Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+Off by default. Set ``TRACE_FILE`` in constants.py, or the ``DGE_TRACE``
+environment variable, to a path and import this module before anything else
+you want timed:
+
+    DGE_TRACE=startup.json python balancescale/start.py
+
+Module imports, image/font/sound loads and every span opened with ``span``
+are recorded, then written out when the process exits. While disabled,
+``span`` hands back one shared no-op context, so call sites cost a global
+lookup and a call.
+"""
+import atexit
+import contextlib
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from constants import TRACE_FILE, TRACE_MAX_EVENTS
+
+enabled = False
+path = None
+events = []  # (name, category, start, duration, thread, args); seconds on perf_counter
+origin = time.perf_counter()
+_null = contextlib.nullcontext()
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        complete(self.name, self.start, time.perf_counter() - self.start, self.category, self.args)
+
+def span(name, category="app", **args):
+    """Context manager timing its block as one span."""
+    if not enabled:
+        return _null
+    return _Span(name, category, args or None)
+
+def complete(name, start, duration, category="app", args=None):
+    # Record a span measured elsewhere; start is a perf_counter() value
+    if enabled and len(events) < TRACE_MAX_EVENTS:
+        events.append((name, category, start, duration, threading.get_native_id(), args))
+
+class _TracedLoader:
+    def __init__(self, loader, name):
+        self.loader = loader
+        self.name = name
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        with span(self.name, "import"):
+            self.loader.exec_module(module)
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+class _ImportTracer(importlib.abc.MetaPathFinder):
+    # Asks the real finders for the spec, then times the module's execution
+    def __init__(self):
+        self.local = threading.local()
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self.local, "finding", False):
+            return None
+        self.local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TracedLoader(spec.loader, name)
+        return spec
+
+def _instrument_pygame():
+    # Every asset load in the game goes through these, wherever it is called
+    import pygame
+    import pygame.mixer
+
+    def wrap(owner, attr, category):
+        load = getattr(owner, attr)
+
+        def traced_load(file, *args, **kwargs):
+            with span(f"{attr} {os.path.basename(str(file))}", category, file=str(file)):
+                return load(file, *args, **kwargs)
+        setattr(owner, attr, traced_load)
+
+    wrap(pygame.image, "load", "asset")
+    wrap(pygame.mixer.music, "load", "asset")
+
+    class Font(pygame.font.Font):
+        def __init__(self, file=None, size=12, *args):
+            with span(f"font {os.path.basename(str(file))} {size}", "font", file=str(file)):
+                super().__init__(file, size, *args)
+
+    class Sound(pygame.mixer.Sound):
+        def __init__(self, *args, **kwargs):
+            file = args[0] if args else kwargs.get("file")
+            with span(f"sound {os.path.basename(str(file))}", "asset", file=str(file)):
+                super().__init__(*args, **kwargs)
+
+    pygame.font.Font = Font
+    pygame.mixer.Sound = Sound
+
+def enable(trace_path):
+    """Start tracing; events are written to trace_path at exit."""
+    global enabled, path
+    if enabled:
+        return
+    enabled = True
+    path = trace_path
+    sys.meta_path.insert(0, _ImportTracer())
+    _instrument_pygame()
+    atexit.register(write)
+
+def write(trace_path=None):
+    """Write the recorded events as a Chrome trace; returns the event count."""
+    trace_path = trace_path or path
+    pid = os.getpid()
+    trace = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+              "args": {"name": "balancescale"}}]
+    for name, category, start, duration, thread, args in events:
+        event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": thread,
+                 "ts": round((start - origin) * 1e6, 1), "dur": round(duration * 1e6, 1)}
+        if args:
+            event["args"] = args
+        trace.append(event)
+    if len(events) >= TRACE_MAX_EVENTS:
+        print(f"Trace stopped at {TRACE_MAX_EVENTS} events")
+    with open(trace_path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return len(events)
+
+if os.environ.get("DGE_TRACE") or TRACE_FILE:
+    enable(os.environ.get("DGE_TRACE") or TRACE_FILE)